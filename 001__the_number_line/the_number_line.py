@@ -2,6 +2,7 @@
 Created on Wed Mar 24 18:19:25 2021
 """
 
+import diagnostics
 import error_utilities as e_utils
 
 
@@ -30,9 +31,11 @@ class NumberLine:
         positive_position = self.start + self.magnitude
         negative_position = self.start - self.magnitude
 
-        print(f'The starting position is {self.start}.\n'
-              f'With no direction specified, the object can have either '
-              f'{negative_position} or {positive_position} position.')
+        diagnostics.report('position_summary',
+                           lambda: f'The starting position is {self.start}.\n'
+                                   f'With no direction specified, the object can have '
+                                   f'either {negative_position} or {positive_position} '
+                                   f'position.')
 
         return [positive_position, negative_position]
 
@@ -42,9 +45,11 @@ class NumberLine:
 
         obj_position = self.start + self.magnitude
 
-        print(f'The starting position of the object is {self.start}.\n With a '
-              f'magnitude of {self.magnitude}, the final position of the object is '
-              f'{obj_position}.')
+        diagnostics.report('position_summary',
+                           lambda: f'The starting position of the object is '
+                                   f'{self.start}.\n With a magnitude of '
+                                   f'{self.magnitude}, the final position of the object '
+                                   f'is {obj_position}.')
 
         return obj_position
 
@@ -53,8 +58,9 @@ class NumberLine:
             raise e_utils.FloatNotPassed('Parameter type should be of float type.')
 
         if self.magnitude < 0:
-            print('Magnitude cannot be negative with a given direction, assuming '
-                  'positive')
+            diagnostics.report('negative_magnitude',
+                               'Magnitude cannot be negative with a given direction, '
+                               'assuming positive')
             self.magnitude = abs(self.magnitude)
 
         if direction not in ['positive', 'negative']:
@@ -65,8 +71,10 @@ class NumberLine:
         else:
             pos = self.start + self.magnitude
 
-        print(f'The starting position of the object is {self.start}.\n'
-              f'With a magnitude of {self.magnitude} and a {direction} direction, '
-              f'the current position is {pos}.')
+        diagnostics.report('position_summary',
+                           lambda: f'The starting position of the object is '
+                                   f'{self.start}.\nWith a magnitude of {self.magnitude} '
+                                   f'and a {direction} direction, the current position '
+                                   f'is {pos}.')
 
         return pos
@@ -5,32 +5,67 @@ Created on Thu Apr  1 01:12:40 2021
 import numpy as np
 
 
-def cartesian2spherical(rectangular_coordinates):
+def cartesian2spherical(rectangular_coordinates, deg_rad: str = 'rad', out=None):
     """
     Converts Cartesian coordinates to spherical coordinates.
 
     Parameters
     ----------
     rectangular_coordinates:
-        A list of coordinates of the point in Cartesian space.
+        A list of coordinates of the point in Cartesian space, or an (N, 3) array of
+        points, one (x, y, z) per row.
+    deg_rad: str, optional
+        Whether theta and phi are returned in degrees or radians. The default is 'rad'.
+    out: optional
+        A preallocated (N, 3) float array for the (rho, theta, phi) rows, or a (3,)
+        array for a single point. It may be the input array itself. The default is
+        None.
 
     Returns
     -------
     list:
-        Spherical coordinates of the input Cartesian coordinates.
+        Spherical coordinates of the input Cartesian coordinates, as a tuple for a
+        single point or as an (N, 3) array of (rho, theta, phi) rows.
     """
 
-    # initialize the coordinates
-    x, y, z = rectangular_coordinates
+    coordinates = np.asarray(rectangular_coordinates, dtype=float)
 
-    # calculate rho
-    rho = np.sqrt(x**2 + y**2 + z**2)
+    if coordinates.ndim == 1:
+        _out = np.empty(3) if out is None else out
+        cartesian2spherical(coordinates[None], deg_rad, _out[None])
+
+        return tuple(_out)
+
+    if out is None:
+        out = np.empty(coordinates.shape)
+
+    # initialize the coordinates, as column views
+    x, y, z = np.moveaxis(coordinates, -1, 0)
+    rho, theta, phi = np.moveaxis(out, -1, 0)
+
+    # every column is computed before out is written, so that out may be the input
+    # array itself
+
+    # squared distance from the z-axis
+    _rho2 = x * x
+    _rho2 += y * y
 
     # calculate theta, the reason for using arctan2 is that the range of theta
     # parameter is -180 < theta < 180.
-    theta = np.arctan2(y, x)
+    _theta = np.arctan2(y, x)
+
+    # calculate phi, with arctan2 rather than arccos(z / rho) so that rho = 0 gives
+    # phi = 0 instead of a division by zero
+    _phi = np.arctan2(np.sqrt(_rho2), z)
+
+    # calculate rho
+    _rho2 += z * z
+    np.sqrt(_rho2, out=rho)
 
-    # calculate phi
-    phi = np.arccos(z / rho)
+    if deg_rad == 'deg':
+        np.degrees(_theta, out=theta)
+        np.degrees(_phi, out=phi)
+    else:
+        theta[...], phi[...] = _theta, _phi
 
-    return rho, theta, phi
+    return out
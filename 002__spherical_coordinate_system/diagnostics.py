@@ -0,0 +1,113 @@
+"""
+Created on Oct 18 13:52:10 2026
+"""
+
+import logging
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Union
+
+MODES = ('silent', 'print', 'warn', 'log')
+
+Message = Union[str, Callable[[], str]]
+
+logger = logging.getLogger(__name__)
+
+
+class DiagnosticWarning(UserWarning):
+    pass
+
+
+class Diagnostics:
+    """
+    Diagnostics collects the notices raised by the conversion functions. Every notice
+    is counted under its key, and is emitted only if the mode asks for it:
+
+    1- silent: count only (the default)
+    2- print: print the message, as the functions used to do
+    3- warn: issue a DiagnosticWarning through the warnings module
+    4- log: log the message at WARNING level
+    """
+
+    def __init__(self, mode: str = 'silent'):
+        self.counts = Counter()
+        self.mode = mode
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: str):
+        if mode not in MODES:
+            raise ValueError(f'The mode must be one of {", ".join(MODES)}.')
+
+        self._mode = mode
+
+    def report(self, key: str, message: Message, count: int = 1):
+        """
+        Count a notice and emit it according to the mode.
+
+        Parameters
+        ----------
+        key : str
+            Type of the notice, used as the counter name.
+        message : Message
+            Human readable message, or a function without arguments returning it,
+            which is only called if the mode emits the message. Messages that are
+            costly to format, e.g. on a per-call path, should be given that way.
+        count : int, optional
+            Number of occurrences to add, e.g. the number of rows in a batch that
+            triggered the notice. The default is 1.
+
+        """
+        self.counts[key] += int(count)
+
+        if self._mode == 'silent':
+            return
+
+        if callable(message):
+            message = message()
+
+        if self._mode == 'print':
+            print(message)
+        elif self._mode == 'warn':
+            warnings.warn(message, DiagnosticWarning, stacklevel=3)
+        elif self._mode == 'log':
+            logger.warning(message)
+
+    def get_counts(self) -> Dict[str, int]:
+        return dict(self.counts)
+
+    def reset(self):
+        self.counts.clear()
+
+    @contextmanager
+    def using(self, mode: str):
+        """Temporarily switch to another mode within a with block."""
+        _previous, self.mode = self._mode, mode
+
+        try:
+            yield self
+        finally:
+            self.mode = _previous
+
+
+diagnostics = Diagnostics()
+
+
+def report(key: str, message: Message, count: int = 1):
+    diagnostics.report(key, message, count)
+
+
+def set_mode(mode: str):
+    diagnostics.mode = mode
+
+
+def get_counts() -> Dict[str, int]:
+    return diagnostics.get_counts()
+
+
+def reset():
+    diagnostics.reset()
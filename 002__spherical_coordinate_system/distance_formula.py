@@ -6,7 +6,71 @@ from typing import List
 
 import numpy as np
 
-ListOfFloats = List[float, float, float]
+ListOfFloats = List[float]
+
+
+def distance_formula_array(final_coordinates, initial_coordinates=None,
+                           deg_rad: str = 'rad', squared: bool = False) -> np.ndarray:
+    """
+    Calculates the distances between many pairs of points in spherical coordinate
+    system at once.
+
+    Parameters
+    ----------
+    final_coordinates:
+        An (N, 3) array of (r, theta, phi) rows, theta being the polar angle and phi the
+        azimuthal angle as in distance_formula.
+    initial_coordinates: optional
+        An (N, 3) array of reference points, or a single point for all rows. The
+        default is None, for the origin.
+    deg_rad: str, optional
+        Whether the theta and phi columns are in degree or radians. The default is
+        'rad'.
+    squared: bool, optional
+        Return the squared distances, skipping the square root. The default is False.
+
+    Returns
+    ----------
+    np.ndarray:
+        The N distances.
+
+    Notes
+    ----------
+        The law of cosines, r1^2 + r2^2 - 2 r1 r2 cos(gamma), subtracts two nearly
+        equal numbers for close points and can even go negative. It is rewritten here
+        with half-angle sines, as
+
+            (r1 - r2)^2 + 4 r1 r2 [sin^2(dtheta / 2) + sin(theta1) sin(theta2)
+                                   sin^2(dphi / 2)]
+
+        a sum of non-negative terms which keeps its relative precision down to
+        vanishing separations.
+    """
+
+    final_coordinates = np.asarray(final_coordinates, dtype=float)
+    initial_coordinates = np.zeros(3) if initial_coordinates is None else np.asarray(
+        initial_coordinates, dtype=float)
+
+    r1, theta1, phi1 = np.moveaxis(initial_coordinates, -1, 0)
+    r2, theta2, phi2 = np.moveaxis(final_coordinates, -1, 0)
+
+    if deg_rad == 'deg':
+        theta1, phi1 = np.radians(theta1), np.radians(phi1)
+        theta2, phi2 = np.radians(theta2), np.radians(phi2)
+
+    _half_theta = np.sin((theta1 - theta2) / 2)
+    _half_theta *= _half_theta
+
+    _half_phi = np.sin((phi1 - phi2) / 2)
+    _half_phi *= _half_phi
+    _half_phi *= np.sin(theta1) * np.sin(theta2)
+
+    # 4 r1 r2 (1 - cos(gamma)) / 2, plus the radial term
+    distance = _half_theta + _half_phi
+    distance *= 4 * r1 * r2
+    distance += (r1 - r2)**2
+
+    return distance if squared else np.sqrt(distance)
 
 
 def distance_formula(final_coordinates: ListOfFloats,
@@ -16,9 +80,9 @@ def distance_formula(final_coordinates: ListOfFloats,
     Calculates the distance between two given points in spherical coordinate system
     Parameters
     ----------
-    final_coordinates: List[float, float, float]
+    final_coordinates: List[float]
         Final coordinates of the point to which the distance is to be calculated.
-    initial_coordinates: List[float, float, float]
+    initial_coordinates: List[float]
         Reference coordinates of the point. The default is None.
     deg_rad: str, optional
         Whether the specified theta and phi arguments are in degree or radians.
@@ -33,17 +97,5 @@ def distance_formula(final_coordinates: ListOfFloats,
     if initial_coordinates is None:
         initial_coordinates = [0, 0, 0]
 
-    r1, theta1, phi1 = initial_coordinates
-    r2, theta2, phi2 = final_coordinates
-
-    theta1, phi1 = np.radians([theta1, phi1]) if deg_rad == 'deg' else theta2, phi1
-    theta2, phi2 = np.radians([theta2, phi2]) if deg_rad == 'deg' else theta2, phi2
-
-    p1 = r1**2 + r2**2
-
-    _comp1 = np.sin(theta1) * np.sin(theta2) * np.cos(phi1 - phi2)
-    _comp2 = np.cos(theta1) * np.cos(theta2)
-
-    p2 = 2 * r1 * r2 * (_comp1 + _comp2)
-
-    return np.sqrt(p1 - p2)
+    return float(distance_formula_array(final_coordinates, initial_coordinates,
+                                        deg_rad))
@@ -14,19 +14,24 @@ class NegativeValueFound(SphericalCoordinatesErrors):
     pass
 
 
-def ensure_theta(theta: Union[list, float]):
+def ensure_theta(theta: Union[list, float, np.ndarray]):
     # in part taken from https://stackoverflow.com/a/50457453
-    return [x % (2 * np.pi) for x in theta] if isinstance(theta, list) else theta % (
-            2 * np.pi)
+    return list(np.mod(theta, 2 * np.pi)) if isinstance(theta, list) else np.mod(
+        theta, 2 * np.pi)
 
 
-def ensure_phi(phi: Union[list, float]):
+def ensure_phi(phi: Union[list, float, np.ndarray]):
     # in part taken from https://stackoverflow.com/a/50457453
-    return [x % np.pi for x in phi] if isinstance(phi, list) else phi % np.pi
+    return list(np.mod(phi, np.pi)) if isinstance(phi, list) else np.mod(phi, np.pi)
+
+
+def ensure_non_negative(values):
+    if np.any(np.asarray(values) < 0):
+        raise NegativeValueFound('Found negative value, these parameters can not be '
+                                 'negative.')
 
 
 def ensure_positive(args):
-    _sum = np.sum(args, axis=0)
-    if any(x < 0 for x in _sum):
+    if np.any(np.sum(args, axis=0) < 0):
         raise NegativeValueFound('Found negative sum, these parameters can not have a '
                                  'negative sum.')
@@ -0,0 +1,118 @@
+"""
+Created on Oct 18 19:41:08 2026
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator
+
+import numpy as np
+
+import error_utilities as e_utils
+
+
+def _positions(steps: np.ndarray, start: np.ndarray, deg_rad: str) -> np.ndarray:
+    """
+    Positions after each of the (n, 3) steps from start, with the validation of
+    translation_in_coordinates and theta and phi normalized. The steps are summed in
+    place.
+    """
+    positions = np.cumsum(steps, axis=0, out=steps)
+    positions += start
+
+    # the raw sums must be positive, as in translation_in_coordinates
+    e_utils.ensure_non_negative(positions)
+
+    angles = positions[:, 1:]
+
+    if deg_rad == 'deg':
+        np.radians(angles, out=angles)
+
+    angles[:, 0] = e_utils.ensure_theta(angles[:, 0])
+    angles[:, 1] = e_utils.ensure_phi(angles[:, 1])
+
+    if deg_rad == 'deg':
+        np.degrees(angles, out=angles)
+
+    return positions
+
+
+def iter_trajectory(steps: Iterable, starting_point=(0, 0, 0), deg_rad: str = 'rad',
+                    chunk_size: int = 65_536) -> Iterator[np.ndarray]:
+    """
+    Follows a point through a stream of translations, in chunks, so the number of
+    steps does not need to be known or to fit in memory.
+
+    Parameters
+    ----------
+    steps:
+        An iterable, e.g. a generator, of <r, theta, phi> translations.
+    starting_point:
+        Starting coordinates of the point in spherical coordinates. The default is
+        (0, 0, 0).
+    deg_rad:
+        Whether the theta and phi arguments are in degree or radians. The default is
+        'rad'.
+    chunk_size: int, optional
+        Number of steps converted at once. The default is 65_536.
+
+    Yields
+    ----------
+    np.ndarray:
+        (n, 3) arrays of the successive positions, n <= chunk_size, in the units of
+        deg_rad.
+    """
+
+    steps = iter(steps)
+    _carry = np.asarray(starting_point, dtype=float)
+
+    while True:
+        _chunk = np.array(list(islice(steps, chunk_size)), dtype=float).reshape(-1, 3)
+
+        if len(_chunk) == 0:
+            return
+
+        # the running position, before normalization, starts the next chunk
+        _next = _carry + _chunk.sum(axis=0)
+        yield _positions(_chunk, _carry, deg_rad)
+        _carry = _next
+
+
+def trajectory(steps, starting_point=(0, 0, 0), deg_rad: str = 'rad') -> np.ndarray:
+    """
+    Calculates all the positions of a point in spherical system given a sequence of
+    translations, chaining the sums of translation_in_coordinates.
+
+    Parameters
+    ----------
+    steps:
+        A (steps, 3) array or a sequence of <r, theta, phi> translations. Iterators and
+        generators are consumed with iter_trajectory.
+    starting_point:
+        Starting coordinates of the point in spherical coordinates. The default is
+        (0, 0, 0).
+    deg_rad:
+        Whether the theta and phi arguments are in degree or radians. The default is
+        'rad'.
+
+    Returns
+    ----------
+    np.ndarray:
+        A (steps, 3) array of the positions after each step, with theta in [0, 2pi)
+        and phi in [0, pi), in the units of deg_rad.
+
+    Notes
+    ----------
+        Unlike translation_in_coordinates, which returns the raw sums in radians
+        whatever deg_rad is, the angles here are normalized and given in the units
+        of the input. In radians, the positions are those of repeated calls of
+        translation_in_coordinates once normalized.
+    """
+
+    if not isinstance(steps, (np.ndarray, list, tuple)):
+        _chunks = list(iter_trajectory(steps, starting_point, deg_rad))
+
+        return np.concatenate(_chunks) if _chunks else np.empty((0, 3))
+
+    steps = np.array(steps, dtype=float).reshape(-1, 3)
+
+    return _positions(steps, np.asarray(starting_point, dtype=float), deg_rad)
@@ -4,6 +4,7 @@ Created on May 12 22:49:49 2022
 
 import numpy as np
 
+import diagnostics
 import error_utilities as e_utils
 
 
@@ -36,8 +37,8 @@ def translation_in_coordinates(change_in_coordinates, starting_point=(0, 0, 0),
     r2, theta2, phi2 = change_in_coordinates
 
     # convert theta and phi to radians if not already
-    theta1, phi1 = np.radians([theta1, phi1]) if deg_rad == 'deg' else theta2, phi1
-    theta2, phi2 = np.radians([theta2, phi2]) if deg_rad == 'deg' else theta2, phi2
+    if deg_rad == 'deg':
+        theta1, phi1, theta2, phi2 = np.radians([theta1, phi1, theta2, phi2])
 
     # make sure that theta does not exceed 360
     _theta1, _theta2 = e_utils.ensure_theta([theta1, theta2])
@@ -47,9 +48,11 @@ def translation_in_coordinates(change_in_coordinates, starting_point=(0, 0, 0),
 
     _changed = [sum(x) for x in zip((r1, theta1, phi1), (r2, theta2, phi2))]
 
-    print(f'The starting coordinates of the point were {r1}, {np.degrees(_theta1)}, '
-          f'{np.degrees(_phi1)} in degrees.\n'
-          f'The new coordinates of the point are {_changed[0]}, '
-          f'{np.degrees(_changed[1])}, {np.degrees(_changed[2])}')
+    diagnostics.report('translation_summary',
+                       lambda: f'The starting coordinates of the point were {r1}, '
+                               f'{np.degrees(_theta1)}, {np.degrees(_phi1)} in '
+                               f'degrees.\nThe new coordinates of the point are '
+                               f'{_changed[0]}, {np.degrees(_changed[1])}, '
+                               f'{np.degrees(_changed[2])}')
 
     return _changed
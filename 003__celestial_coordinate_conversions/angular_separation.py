@@ -0,0 +1,190 @@
+"""
+Created on Oct 18 15:12:48 2026
+"""
+
+from typing import Iterator, Tuple
+
+import numpy as np
+
+import conversion_utilities as utils
+
+np_arr = utils.np_arr
+
+Block = Tuple[int, int, np_arr]
+
+
+def _terms(longitude, latitude, deg_rad: str) -> Tuple[np_arr, ...]:
+    """sin/cos of the longitudes and latitudes, in radians."""
+    longitude = np.asarray(longitude, dtype=float)
+    latitude = np.asarray(latitude, dtype=float)
+
+    if deg_rad == 'deg':
+        longitude, latitude = np.radians(longitude), np.radians(latitude)
+
+    return (np.sin(longitude), np.cos(longitude),
+            np.sin(latitude), np.cos(latitude))
+
+
+def _vincenty(terms1: Tuple[np_arr, ...], terms2: Tuple[np_arr, ...],
+              deg_rad: str) -> np_arr:
+    """Vincenty separation from precomputed sin/cos terms, which broadcast."""
+    sin_lon1, cos_lon1, sin_lat1, cos_lat1 = terms1
+    sin_lon2, cos_lon2, sin_lat2, cos_lat2 = terms2
+
+    # sin/cos of the longitude difference by the angle subtraction formulas, so that
+    # no trig is evaluated per pair
+    sin_dlon = sin_lon2 * cos_lon1 - cos_lon2 * sin_lon1
+    cos_dlon = cos_lon2 * cos_lon1 + sin_lon2 * sin_lon1
+
+    _cos_lat2_cos_dlon = cos_lat2 * cos_dlon
+
+    numerator = np.hypot(cos_lat2 * sin_dlon,
+                         cos_lat1 * sin_lat2 - sin_lat1 * _cos_lat2_cos_dlon)
+    denominator = sin_lat1 * sin_lat2 + cos_lat1 * _cos_lat2_cos_dlon
+
+    separation = np.arctan2(numerator, denominator)
+
+    return np.degrees(separation) if deg_rad == 'deg' else separation
+
+
+def separation(longitude1, latitude1, longitude2, latitude2,
+               deg_rad: str = 'deg') -> np_arr:
+    """
+    Compute angular separations with the Vincenty formula.
+
+    Parameters
+    ----------
+    longitude1 :
+        Longitude(s) of the first set of positions (RA, ecliptic or galactic
+        longitude).
+    latitude1 :
+        Latitude(s) of the first set of positions.
+    longitude2 :
+        Longitude(s) of the second set of positions.
+    latitude2 :
+        Latitude(s) of the second set of positions.
+    deg_rad : str, optional
+        Whether the input and output angles are in degrees or radians. The default is
+        'deg'.
+
+    Returns
+    -------
+    np_arr
+        Angular separations, broadcast from the inputs. Equal shapes give paired
+        separations, and a single position against arrays gives one-to-many
+        separations.
+
+    Notes
+    -------
+        Unlike the arccos of the dot product, the Vincenty formula keeps its accuracy
+        for both very small and nearly antipodal separations.
+
+    """
+    return _vincenty(_terms(longitude1, latitude1, deg_rad),
+                     _terms(longitude2, latitude2, deg_rad), deg_rad)
+
+
+def separation_blocks(longitude1, latitude1, longitude2=None, latitude2=None,
+                      block_size: int = 1024, deg_rad: str = 'deg') -> Iterator[Block]:
+    """
+    Compute the all-pairs separations of two catalogs, one block at a time.
+
+    Parameters
+    ----------
+    longitude1 :
+        Longitudes of the first catalog.
+    latitude1 :
+        Latitudes of the first catalog.
+    longitude2 : optional
+        Longitudes of the second catalog. The default is None, for the pairs within the
+        first catalog.
+    latitude2 : optional
+        Latitudes of the second catalog. The default is None.
+    block_size : int, optional
+        Number of rows and of columns per block. The default is 1024.
+    deg_rad : str, optional
+        Whether the input and output angles are in degrees or radians. The default is
+        'deg'.
+
+    Yields
+    ------
+    Block
+        Row and column offsets of the block, and the (rows, columns) separation
+        matrix. Within a single catalog, only the blocks on and above the diagonal are
+        yielded.
+
+    Notes
+    -------
+        At most block_size**2 separations are alive at any time, whatever the size of
+        the catalogs.
+
+    """
+    single = longitude2 is None
+
+    terms1 = [i.ravel() for i in _terms(longitude1, latitude1, deg_rad)]
+    terms2 = terms1 if single else [i.ravel() for i in _terms(longitude2, latitude2,
+                                                               deg_rad)]
+
+    n_rows, n_columns = terms1[0].size, terms2[0].size
+
+    for i in range(0, n_rows, block_size):
+        _rows = [k[i:i + block_size, None] for k in terms1]
+
+        for j in range(i if single else 0, n_columns, block_size):
+            _columns = [k[None, j:j + block_size] for k in terms2]
+
+            yield i, j, _vincenty(_rows, _columns, deg_rad)
+
+
+def pairs_within(longitude1, latitude1, longitude2=None, latitude2=None,
+                 max_separation: float = 1 / 3600, block_size: int = 1024,
+                 deg_rad: str = 'deg') -> Tuple[np_arr, np_arr, np_arr]:
+    """
+    Find all the pairs of positions closer than a threshold, as sparse arrays.
+
+    Parameters
+    ----------
+    longitude1 :
+        Longitudes of the first catalog.
+    latitude1 :
+        Latitudes of the first catalog.
+    longitude2 : optional
+        Longitudes of the second catalog. The default is None, for the pairs within the
+        first catalog.
+    latitude2 : optional
+        Latitudes of the second catalog. The default is None.
+    max_separation : float, optional
+        Largest separation of a pair, inclusive. The default is 1 / 3600, i.e. one
+        arcsecond in degrees.
+    block_size : int, optional
+        Number of rows and of columns per block. The default is 1024.
+    deg_rad : str, optional
+        Whether the angles are in degrees or radians. The default is 'deg'.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr, np_arr]
+        Indices in the first catalog, indices in the second catalog and separations of
+        the pairs. Within a single catalog, every pair is given once with i < j.
+
+    """
+    single = longitude2 is None
+    _i, _j, _separation = [], [], []
+
+    for i, j, block in separation_blocks(longitude1, latitude1, longitude2, latitude2,
+                                         block_size, deg_rad):
+        close = block <= max_separation
+
+        if single and i == j:
+            close = np.triu(close, k=1)
+
+        rows, columns = np.nonzero(close)
+
+        _i.append(rows + i)
+        _j.append(columns + j)
+        _separation.append(block[rows, columns])
+
+    if not _i:
+        return np.empty(0, np.intp), np.empty(0, np.intp), np.empty(0)
+
+    return np.concatenate(_i), np.concatenate(_j), np.concatenate(_separation)
@@ -0,0 +1,627 @@
+"""
+Created on Oct 18 10:12:31 2026
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+import zlib
+from functools import partial
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+import celestial_coordinates as cc
+import conversion_utilities as utils
+import fast_trig
+import frames
+import parallel
+
+
+def _timeit(func, *args, repeat: int = 3, min_time: float = 0.) -> float:
+    """
+    Return the best wall-clock time of at least `repeat` calls of func(*args), calling
+    it again until the calls add up to min_time seconds.
+    """
+    best, total, calls = np.inf, 0., 0
+    while calls < repeat or total < min_time:
+        _start = perf_counter()
+        func(*args)
+        _time = perf_counter() - _start
+
+        best, total, calls = min(best, _time), total + _time, calls + 1
+
+    return best
+
+
+def _random_sexagesimal(n_values: int, in_type: str = 'dms', seed: int = 0) -> np.ndarray:
+    """Generate synthetic DMS or HMS strings for benchmarking."""
+    rng = np.random.default_rng(seed)
+
+    if in_type == 'dms':
+        _first = rng.integers(-89, 90, n_values)
+    else:
+        _first = rng.integers(0, 24, n_values)
+
+    _min = rng.integers(0, 60, n_values)
+    _sec = rng.uniform(0, 60, n_values).round(2)
+
+    return np.array([f'{d}:{m:02d}:{s:05.2f}' for d, m, s in zip(_first, _min, _sec)])
+
+
+def benchmark_sexagesimal_parsing(n_values: int = 1_000_000):
+    """
+    Compare the bulk DMS/HMS parsers against the per-string loop.
+
+    Parameters
+    ----------
+    n_values : int, optional
+        Number of synthetic strings to parse. The default is 1_000_000.
+
+    """
+    for in_type, scalar, bulk in [('dms', utils.dms2dd, utils.dms2dd_array),
+                                  ('hms', utils.hms2dd, utils.hms2dd_array)]:
+        strings = _random_sexagesimal(n_values, in_type)
+
+        _loop = _timeit(lambda x: [scalar(i) for i in x], strings, repeat=1)
+        _bulk = _timeit(bulk, strings)
+
+        _ref = np.array([scalar(i) for i in strings])
+        _max_diff = np.max(np.abs(bulk(strings)[0] - _ref))
+
+        print(f'{in_type}2dd: loop {_loop:.3f} s, bulk {_bulk:.3f} s, '
+              f'speedup {_loop / _bulk:.1f}x, max |diff| {_max_diff:.2e} deg')
+
+
+def benchmark_sexagesimal_formatting(n_values: int = 1_000_000):
+    """
+    Compare the bulk DMS/HMS formatters against the per-value loop.
+
+    Parameters
+    ----------
+    n_values : int, optional
+        Number of synthetic degree values to format. The default is 1_000_000.
+
+    """
+    values = np.random.default_rng(0).uniform(-90, 90, n_values)
+
+    for name, scalar, bulk in [('dd2dms', utils.dd2dms, utils.dd2dms_array),
+                               ('dd2hms', utils.dd2hms, utils.dd2hms_array)]:
+        _values = values if name == 'dd2dms' else np.abs(values) * 4
+
+        _loop = _timeit(lambda x: [scalar(i) for i in x], _values, repeat=1)
+        _bulk = _timeit(bulk, _values)
+
+        print(f'{name}: loop {_loop:.3f} s, bulk {_bulk:.3f} s, '
+              f'speedup {_loop / _bulk:.1f}x')
+
+
+def _angular_error_arcsec(lon1, lat1, lon2, lat2) -> np.ndarray:
+    """Angular distance in arcseconds between two sets of positions in degrees."""
+    lon1, lat1, lon2, lat2 = [np.radians(np.asarray(i, dtype=np.float64)) for i in
+                              [lon1, lat1, lon2, lat2]]
+
+    _hav = np.sin((lat2 - lat1) / 2)**2
+    _hav += np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2)**2
+
+    return np.degrees(2 * np.arcsin(np.sqrt(np.clip(_hav, 0, 1)))) * 3600
+
+
+def benchmark_precision(n_values: int = 1_000_000, error_bound: float = 1.):
+    """
+    Compare the float32 mode of the batch conversions against float64.
+
+    For every frame transform and for equatorial2horizontal_array, report the
+    worst-case angular error of the float32 results against the float64 ones and the
+    throughput of both.
+
+    Parameters
+    ----------
+    n_values : int, optional
+        Number of synthetic positions. The default is 1_000_000.
+    error_bound : float, optional
+        Error in arcseconds above which a transform is flagged as failing. The default
+        is 1.
+
+    Returns
+    -------
+    bool
+        Whether every transform stays within error_bound.
+
+    """
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(0, 360, n_values)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n_values)))
+    hour_angle = rng.uniform(0, 360, n_values)
+
+    cases = {f'{i} -> {j}': (lambda dtype, i=i, j=j:
+                             frames.transform(lon, lat, i, j, dtype=dtype))
+             for i in frames.FRAMES for j in frames.FRAMES if i != j}
+    cases['equatorial -> horizontal'] = (
+        lambda dtype: cc.equatorial2horizontal_array(35., lat, hour_angle=hour_angle,
+                                                     dtype=dtype))
+
+    passed = True
+
+    for name, func in cases.items():
+        _ref = func(np.float64)
+        _low = func(np.float32)
+
+        _error = np.max(_angular_error_arcsec(*_ref, *_low))
+        _t64, _t32 = _timeit(func, np.float64), _timeit(func, np.float32)
+
+        passed &= bool(_error <= error_bound)
+
+        print(f'{name:<26}: max error {_error:.4f} arcsec, '
+              f'float64 {n_values / _t64 / 1e6:.1f} M/s, '
+              f'float32 {n_values / _t32 / 1e6:.1f} M/s, gain {_t64 / _t32:.2f}x'
+              f'{"" if _error <= error_bound else "  FAIL"}')
+
+    return passed
+
+
+def benchmark_approximate(n_values: int = 1_000_000) -> bool:
+    """
+    Trade-off of the approximate trig mode of equatorial2horizontal_array.
+
+    Report the worst-case angular error against the exact float64 results and the
+    throughput of the exact and approximate kernels, in float64 and float32.
+
+    Parameters
+    ----------
+    n_values : int, optional
+        Number of synthetic positions over the whole sky and latitudes. The default is
+        1_000_000.
+
+    Returns
+    -------
+    bool
+        Whether the approximate mode stays within fast_trig.MAX_ERROR_ARCSEC.
+
+    """
+    rng = np.random.default_rng(0)
+    hour_angle = rng.uniform(0, 360, n_values)
+    declination = np.degrees(np.arcsin(rng.uniform(-1, 1, n_values)))
+    latitude = rng.uniform(-89, 89, n_values)
+
+    def _convert(approximate, dtype):
+        return cc.equatorial2horizontal_array(latitude, declination,
+                                              hour_angle=hour_angle,
+                                              approximate=approximate, dtype=dtype)
+
+    _ref = _convert(False, np.float64)
+    _t_ref = _timeit(_convert, False, np.float64, min_time=1.)
+    passed = True
+
+    for approximate in [False, True]:
+        for dtype in [np.float64, np.float32]:
+            _error = np.max(_angular_error_arcsec(*_ref, *_convert(approximate, dtype)))
+            _time = _timeit(_convert, approximate, dtype, min_time=1.)
+
+            if approximate:
+                passed &= bool(_error <= fast_trig.MAX_ERROR_ARCSEC)
+
+            print(f'{"approximate" if approximate else "exact":<11} '
+                  f'{dtype.__name__:<7}: max error {_error:.4f} arcsec, '
+                  f'{n_values / _time / 1e6:.1f} M/s, gain {_t_ref / _time:.2f}x')
+
+    return passed
+
+
+def benchmark_parallel_scaling(n_values: int = 8_000_000, max_workers: int = None,
+                               chunk_size: int = 250_000):
+    """
+    Measure the speedup of the shared-memory executor against the number of workers.
+
+    Parameters
+    ----------
+    n_values : int, optional
+        Number of synthetic positions. The default is 8_000_000.
+    max_workers : int, optional
+        Largest number of workers, doubled from 1. The default is None, for
+        os.cpu_count().
+    chunk_size : int, optional
+        Number of rows per task. The default is 250_000.
+
+    """
+    rng = np.random.default_rng(0)
+
+    # shared inputs and outputs, which the workers read and write without copies
+    lon, lat, *out = [parallel.shared_empty(n_values) for _ in range(4)]
+    lon[...] = rng.uniform(0, 360, n_values)
+    lat[...] = np.degrees(np.arcsin(rng.uniform(-1, 1, n_values)))
+
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    counts = sorted({min(2**i, max_workers) for i in range(max_workers.bit_length() + 1)})
+
+    def _galactic(workers):
+        parallel.parallel_transform(lon, lat, 'equatorial', 'galactic', workers,
+                                    chunk_size, out)
+
+    def _horizontal(workers):
+        parallel.parallel_equatorial2horizontal(35., lat, hour_angle=lon, workers=workers,
+                                                chunk_size=chunk_size, out=out)
+
+    cases = {'equatorial -> galactic': _galactic,
+             'equatorial -> horizontal': _horizontal}
+
+    print(f'{os.cpu_count()} cores available')
+
+    for name, func in cases.items():
+        _serial = _timeit(func, 1, repeat=1)
+
+        for workers in counts:
+            _time = _serial if workers == 1 else _timeit(func, workers, repeat=1)
+            print(f'{name:<26}: {workers:>3} workers {n_values / _time / 1e6:.1f} M/s, '
+                  f'speedup {_serial / _time:.2f}x')
+
+
+SIZES = {'scalar': 1, '1e3': 1_000, '1e6': 1_000_000, '1e7': 10_000_000}
+
+# number of calls timed for the scalar size, whose single call is too short to time
+_SCALAR_CALLS = 2_000
+
+_CALIBRATION_VALUES = np.linspace(0, 1, 4_096)
+
+
+def _calibration():
+    """Fixed Python and NumPy workload whose speed measures the one of the machine."""
+    for _ in range(20):
+        np.sin(_CALIBRATION_VALUES)
+        [utils.dd2dms(0.5) for _ in range(20)]
+
+
+def _aligned(array: np.ndarray, alignment: int = 64) -> np.ndarray:
+    """
+    Copy of array starting on an alignment-byte boundary. The speed of the SIMD loops
+    depends on the alignment of their inputs, which otherwise changes from one process
+    to the next.
+    """
+    _buffer = np.empty(array.nbytes + alignment, dtype=np.uint8)
+    _offset = -_buffer.ctypes.data % alignment
+
+    aligned = _buffer[_offset:_offset + array.nbytes].view(array.dtype)
+    aligned[...] = array
+
+    return aligned
+
+
+def _synthetic_inputs(n_values: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """Synthetic degrees and DMS/HMS strings, the same for every run."""
+    rng = np.random.default_rng(seed)
+
+    lon = rng.uniform(0, 360, n_values)
+    lat = np.degrees(np.arcsin(rng.uniform(-1, 1, n_values)))
+
+    inputs = {'lon': lon, 'lat': lat, 'local_time': rng.uniform(0, 360, n_values),
+              'dms': utils.dd2dms_array(lat), 'hms': utils.dd2hms_array(lon)}
+
+    return {k: _aligned(v) for k, v in inputs.items()}
+
+
+def _suite_cases() -> Dict[str, Tuple[Callable, Callable, Tuple[str, ...]]]:
+    """
+    Benchmark cases as name -> (scalar function, batch function, input names).
+
+    The scalar function is the legacy per-value API, timed at the scalar size only, and
+    is None where the batch API is the only one. The celestial_coordinates functions
+    keep their names, and the frames.transform equivalents are prefixed with 'frames.'.
+    """
+    cases = {
+        'dms2dd': (utils.dms2dd, lambda x: utils.dms2dd_array(x)[0], ('dms',)),
+        'hms2dd': (utils.hms2dd, lambda x: utils.hms2dd_array(x)[0], ('hms',)),
+        'dd2dms': (utils.dd2dms, utils.dd2dms_array, ('lat',)),
+        'dd2hms': (utils.dd2hms, utils.dd2hms_array, ('lon',)),
+        'RA2HA': (utils.RA2HA, lambda x, y: utils.dd2hms_array(utils.ra2ha(x, y)),
+                  ('hms', 'local_time')),
+    }
+
+    # celestial_coordinates, with string output for the scalar API as by default
+    for name, keys in [('equatorial2ecliptic', ('lon', 'lat')),
+                       ('ecliptic2equatorial', ('lat', 'lon')),
+                       ('equatorial2galactic', ('lon', 'lat')),
+                       ('galactic2equatorial', ('lat', 'lon'))]:
+        _func = getattr(cc, name)
+        cases[name] = (_func, partial(_func, output_type=float), keys)
+
+    cases['equatorial2horizontal'] = (
+        lambda x, y: cc.equatorial2horizontal(35., y, hour_angle=x),
+        lambda x, y: cc.equatorial2horizontal_array(35., y, hour_angle=x),
+        ('lon', 'lat'))
+    cases['horizontal2equatorial'] = (
+        lambda x, y: cc.horizontal2equatorial(35., x, y),
+        lambda x, y: cc.horizontal2equatorial(35., x, y, output_type=float),
+        ('lon', 'lat'))
+
+    for i in frames.FRAMES:
+        for j in frames.FRAMES:
+            if i != j:
+                _transform = partial(frames.transform, from_frame=i, to_frame=j)
+                cases[f'frames.{i}2{j}'] = (None, _transform, ('lon', 'lat'))
+
+    return cases
+
+
+def _checksum(result) -> str:
+    """CRC32 of the outputs, rounded to 1e-9 for floats so it is stable across runs."""
+    crc = 0
+
+    for _out in result if isinstance(result, tuple) else (result,):
+        _out = np.asarray(_out)
+
+        if _out.dtype.kind not in 'US':
+            _out = np.round(_out.astype(np.float64), 9) + 0.
+
+        crc = zlib.crc32(np.ascontiguousarray(_out).tobytes(), crc)
+
+    return f'{crc:08x}'
+
+
+def _traced_call(func: Callable, *args) -> Tuple[float, object]:
+    """Peak memory in MB allocated during func(*args), and its result."""
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak / 2**20, result
+
+
+def _case_call(case: Tuple[Callable, Callable, Tuple[str, ...]],
+               inputs: Dict[str, np.ndarray], size: str) -> Tuple[Callable, list]:
+    """The function and arguments of a case at a size."""
+    scalar, batch, keys = case
+    args = [inputs[i] for i in keys]
+
+    if size == 'scalar':
+        return scalar if scalar is not None else batch, [i[0].item() for i in args]
+
+    return batch, args
+
+
+def run_suite(sizes: List[str] = None, cases: List[str] = None,
+              seed: int = 0, min_time: float = 0.05,
+              rounds: int = 20) -> Dict[str, dict]:
+    """
+    Run the benchmark suite of the conversion layer on synthetic inputs.
+
+    Parameters
+    ----------
+    sizes : List[str], optional
+        Keys of SIZES to run. The default is None, for all of them.
+    cases : List[str], optional
+        Names of the cases to run. The default is None, for all of them.
+    seed : int, optional
+        Seed of the synthetic inputs. The default is 0.
+    min_time : float, optional
+        Smallest time in seconds spent timing each case per round, so short cases
+        get enough calls to be timed. The default is 0.05.
+    rounds : int, optional
+        Number of rounds over all the cases of a size, the best time of a case being
+        kept. The timings of a case are then spread over the whole run, so a slow
+        spell of the machine only affects some of them and a case is not reported
+        slower than it is. The 1e7 size runs one round. The default is 20.
+
+    Returns
+    -------
+    Dict[str, dict]
+        For every 'case[size]', the number of values, the best time in seconds, the
+        throughput in values per second, the peak memory in MB and the checksum of the
+        results. The 'calibration[size]' entries time a fixed workload in the same
+        rounds, for compare_baseline.
+
+    """
+    sizes = list(SIZES) if sizes is None else sizes
+    _cases = _suite_cases()
+    names = list(_cases) if cases is None else cases
+
+    results = {}
+
+    for size in sizes:
+        n_values = SIZES[size]
+        inputs = _synthetic_inputs(n_values, seed)
+        best = dict.fromkeys(names + ['calibration'], np.inf)
+
+        for _ in range(1 if n_values >= 10**7 else rounds):
+            best['calibration'] = min(best['calibration'],
+                                      _timeit(_calibration, min_time=min_time))
+
+            for name in names:
+                func, args = _case_call(_cases[name], inputs, size)
+
+                if size == 'scalar':
+                    _time = _timeit(lambda: [func(*args) for _ in
+                                             range(_SCALAR_CALLS)],
+                                    min_time=min_time) / _SCALAR_CALLS
+                else:
+                    _time = _timeit(func, *args, repeat=1, min_time=min_time)
+
+                best[name] = min(best[name], _time)
+
+        results[f'calibration[{size}]'] = {'n': 1, 'seconds': best['calibration'],
+                                           'throughput': 1 / best['calibration'],
+                                           'peak_mb': 0., 'checksum': ''}
+
+        for name in names:
+            func, args = _case_call(_cases[name], inputs, size)
+
+            _peak, _result = _traced_call(func, *args)
+            _key, _crc = f'{name}[{size}]', _checksum(_result)
+            del _result
+
+            _time = best[name]
+            results[_key] = {'n': n_values, 'seconds': _time,
+                             'throughput': n_values / _time, 'peak_mb': _peak,
+                             'checksum': _crc}
+
+            print(f'{_key:<32} {n_values / _time:>14,.0f} /s {_peak:>9.1f} MB '
+                  f'{_crc}')
+
+        del inputs
+
+    return results
+
+
+def save_baseline(results: Dict[str, dict], path: str):
+    """Write suite results to a JSON baseline, with the environment they ran in."""
+    _data = {'environment': {'python': platform.python_version(),
+                             'numpy': np.__version__,
+                             'machine': platform.machine(),
+                             'cpu_count': os.cpu_count()},
+             'results': results}
+
+    with open(path, 'w') as _file:
+        json.dump(_data, _file, indent=2)
+
+
+def compare_baseline(results: Dict[str, dict], path: str,
+                     tolerance: float = 0.2) -> List[str]:
+    """
+    Flag the regressions of suite results against a JSON baseline.
+
+    Parameters
+    ----------
+    results : Dict[str, dict]
+        Results of run_suite.
+    path : str
+        Path of a baseline written by save_baseline.
+    tolerance : float, optional
+        Relative loss of throughput, or gain of peak memory, that is flagged. The
+        default is 0.2.
+
+    Returns
+    -------
+    List[str]
+        One line per regression, empty if there are none. A changed checksum means
+        the results themselves changed.
+
+    Notes
+    -------
+        The baseline throughputs are first scaled by the speed of the machine, the
+        ratio of the calibration throughputs of the run and of the baseline, so a
+        machine that is busier or slower as a whole is not taken for a regression.
+
+    """
+    with open(path) as _file:
+        baseline = json.load(_file)['results']
+
+    regressions = []
+
+    for key, _new in results.items():
+        if key not in baseline or key.startswith('calibration['):
+            continue
+
+        _old = baseline[key]
+
+        _calibration = 'calibration' + key[key.rindex('['):]
+        _speed = (results[_calibration]['throughput'] /
+                  baseline[_calibration]['throughput']
+                  if _calibration in results and _calibration in baseline else 1.)
+
+        if _new['throughput'] < _old['throughput'] * _speed * (1 - tolerance):
+            regressions.append(f'{key}: throughput {_old["throughput"]:,.0f} -> '
+                               f'{_new["throughput"]:,.0f} /s (machine speed '
+                               f'x{_speed:.2f})')
+
+        if _new['peak_mb'] > _old['peak_mb'] * (1 + tolerance) + 1:
+            regressions.append(f'{key}: peak memory {_old["peak_mb"]:.1f} -> '
+                               f'{_new["peak_mb"]:.1f} MB')
+
+        if _new['checksum'] != _old['checksum']:
+            regressions.append(f'{key}: checksum {_old["checksum"]} -> '
+                               f'{_new["checksum"]}')
+
+    return regressions
+
+
+def _confirm_regressions(regressions: List[str], path: str, tolerance: float,
+                         min_time: float, rounds: int) -> List[str]:
+    """
+    Time the cases flagged for throughput again in a new interpreter, and keep only
+    the ones that are still slower than the baseline. The memory layout of a process
+    can make a case slower for the whole run, which more rounds in the same process
+    do not change.
+    """
+    slow = [i.partition(': ')[0] for i in regressions if ': throughput' in i]
+
+    if not slow:
+        return regressions
+
+    names = sorted({i[:i.rindex('[')] for i in slow})
+    sizes = sorted({i[i.rindex('[') + 1:-1] for i in slow}, key=list(SIZES).index)
+
+    with tempfile.TemporaryDirectory() as _directory:
+        _path = os.path.join(_directory, 'confirm.json')
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--sizes', *sizes,
+                        '--cases', *names, '--save', _path, '--min-time',
+                        str(min_time), '--rounds', str(rounds)],
+                       check=True, stdout=subprocess.DEVNULL)
+
+        with open(_path) as _file:
+            _results = json.load(_file)['results']
+
+    confirmed = {i.partition(': ')[0]
+                 for i in compare_baseline(_results, path, tolerance)
+                 if ': throughput' in i}
+
+    return [i for i in regressions if ': throughput' not in i or
+            i.partition(': ')[0] in confirmed]
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Benchmark the celestial conversion layer on synthetic inputs.')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--cases', nargs='+', choices=list(_suite_cases()))
+    parser.add_argument('--save', metavar='PATH', help='write the results as a baseline')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='flag the regressions against a baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='smallest timing time per case and round, in seconds')
+    parser.add_argument('--rounds', type=int, default=20,
+                        help='rounds over the cases, the best time being kept')
+    parser.add_argument('--retries', type=int, default=2,
+                        help='new processes timing the cases flagged for throughput')
+    parser.add_argument('--extra', action='store_true',
+                        help='also run the loop, precision and scaling comparisons')
+
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.cases, min_time=args.min_time,
+                        rounds=args.rounds)
+
+    if args.save:
+        save_baseline(results, args.save)
+
+    if args.extra:
+        benchmark_sexagesimal_parsing()
+        benchmark_sexagesimal_formatting()
+        benchmark_precision()
+        benchmark_approximate()
+        benchmark_parallel_scaling()
+
+    if args.compare:
+        regressions = compare_baseline(results, args.compare, args.tolerance)
+
+        for _ in range(args.retries):
+            regressions = _confirm_regressions(regressions, args.compare,
+                                               args.tolerance, args.min_time,
+                                               args.rounds)
+        print('\n'.join(regressions) if regressions else 'No regression.')
+
+        return int(bool(regressions))
+
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
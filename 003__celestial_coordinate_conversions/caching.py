@@ -0,0 +1,115 @@
+"""
+Created on Oct 18 17:05:36 2026
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+    LRUCache memoizes a pure function of hashable arguments, keeping at most maxsize
+    results and evicting the least recently used one first. Calls with unhashable
+    arguments, e.g. arrays, go straight to the function.
+
+    Unlike functools.lru_cache, the size can be changed after creation with resize.
+    """
+
+    def __init__(self, func: Callable, maxsize: int = 4096):
+        self.func = func
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+        self.__doc__ = func.__doc__
+        self.__name__ = func.__name__
+        self.__wrapped__ = func
+
+    def __call__(self, *args, **kwargs):
+        # keyword arguments are part of the key, in the order they were passed
+        key = args + tuple(kwargs.items()) if kwargs else args
+
+        try:
+            with self._lock:
+                value = self._data[key]
+                self._data.move_to_end(key)
+                self.hits += 1
+
+            return value
+        except KeyError:
+            pass
+        except TypeError:
+            return self.func(*args, **kwargs)
+
+        value = self.func(*args, **kwargs)
+
+        with self._lock:
+            self.misses += 1
+
+            if self.maxsize > 0:
+                self._data[key] = value
+
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+        return value
+
+    def __len__(self):
+        return len(self._data)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def cache_clear(self):
+        """Drop the stored results and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def resize(self, maxsize: int):
+        """Change the number of stored results, evicting the oldest ones if needed."""
+        with self._lock:
+            self.maxsize = maxsize
+
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+
+
+CACHES: Dict[str, LRUCache] = {}
+
+
+def lru_cache(name: str, maxsize: int = 4096) -> Callable[[Callable], LRUCache]:
+    """Decorator wrapping a function in an LRUCache registered under name."""
+    def _decorator(func: Callable) -> LRUCache:
+        CACHES[name] = LRUCache(func, maxsize)
+
+        return CACHES[name]
+
+    return _decorator
+
+
+def cache_info() -> Dict[str, CacheInfo]:
+    """Statistics of every registered cache."""
+    return {name: cache.cache_info() for name, cache in CACHES.items()}
+
+
+def clear_caches():
+    for cache in CACHES.values():
+        cache.cache_clear()
+
+
+def resize_caches(maxsize: int):
+    """Set the size of every registered cache, 0 disabling them."""
+    for cache in CACHES.values():
+        cache.resize(maxsize)
@@ -0,0 +1,309 @@
+"""
+Created on Oct 18 13:05:47 2026
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+import conversion_utilities as utils
+import frames
+from conversion_errors import IncompleteArguments
+
+np_arr = utils.np_arr
+
+Chunk = Tuple[List[str], np_arr, np_arr]
+
+OUTPUT_COLUMNS = {'equatorial': ('ra', 'dec'),
+                  'ecliptic': ('lambda', 'beta'),
+                  'galactic': ('l', 'b')}
+
+
+def _parse_columns(lines: List[str], indices: Tuple[int, int], delimiter: str,
+                   sexagesimal: bool, lon_type: str) -> Tuple[np_arr, np_arr]:
+    """Read the longitude and latitude columns of a block of CSV lines."""
+    if not sexagesimal:
+        _values = np.loadtxt(lines, delimiter=delimiter, usecols=indices, ndmin=2)
+        return _values[:, 0], _values[:, 1]
+
+    _values = np.loadtxt(lines, delimiter=delimiter, usecols=indices, ndmin=2,
+                         dtype=str)
+    lon, _ = (utils.hms2dd_array if lon_type == 'hms' else utils.dms2dd_array)(
+        _values[:, 0])
+    lat, _ = utils.dms2dd_array(_values[:, 1])
+
+    return lon, lat
+
+
+def read_csv_chunks(input_path: str,
+                    lon_column: str,
+                    lat_column: str,
+                    chunk_size: int = 100_000,
+                    delimiter: str = ',',
+                    sexagesimal: bool = False,
+                    lon_type: str = 'hms') -> Iterator[Chunk]:
+    """
+    Read a CSV catalog in bounded-size chunks.
+
+    Parameters
+    ----------
+    input_path : str
+        Path of the CSV file. The first line must be a header with the column names.
+    lon_column : str
+        Name of the longitude-like column (e.g. RA).
+    lat_column : str
+        Name of the latitude-like column (e.g. Dec).
+    chunk_size : int, optional
+        Number of rows per chunk. The default is 100_000.
+    delimiter : str, optional
+        Column delimiter. The default is ','.
+    sexagesimal : bool, optional
+        Whether the coordinate columns are HMS/DMS strings rather than degrees. The
+        default is False.
+    lon_type : str, optional
+        Whether a sexagesimal longitude column is 'hms' or 'dms'. The default is 'hms'.
+
+    Raises
+    ------
+    IncompleteArguments
+        Raised if a coordinate column is missing from the header.
+
+    Yields
+    ------
+    Chunk
+        The header line first, then for every chunk its raw lines and the longitude and
+        latitude arrays in degrees.
+
+    """
+    with open(input_path) as _file:
+        header = _file.readline().rstrip('\r\n')
+        names = [i.strip() for i in header.split(delimiter)]
+
+        for _name in [lon_column, lat_column]:
+            if _name not in names:
+                raise IncompleteArguments(f'Column \'{_name}\' not found in the header '
+                                          f'of {input_path}.')
+
+        indices = names.index(lon_column), names.index(lat_column)
+
+        yield header
+
+        while True:
+            lines = [i.rstrip('\r\n') for i in islice(_file, chunk_size)]
+
+            if not lines:
+                break
+
+            lines = [i for i in lines if i]
+
+            if lines:
+                yield (lines,) + _parse_columns(lines, indices, delimiter, sexagesimal,
+                                            lon_type)
+
+
+def read_fits_chunks(input_path: str,
+                     lon_column: str,
+                     lat_column: str,
+                     chunk_size: int = 100_000,
+                     hdu: int = 1,
+                     delimiter: str = ',') -> Iterator[Chunk]:
+    """
+    Read a FITS binary table in bounded-size chunks through a memory map.
+
+    Parameters
+    ----------
+    input_path : str
+        Path of the FITS file.
+    lon_column : str
+        Name of the longitude-like column, in degrees.
+    lat_column : str
+        Name of the latitude-like column, in degrees.
+    chunk_size : int, optional
+        Number of rows per chunk. The default is 100_000.
+    hdu : int, optional
+        Index of the table HDU. The default is 1.
+    delimiter : str, optional
+        Delimiter used to write the input columns to the output. The default is ','.
+
+    Yields
+    ------
+    Chunk
+        A header line first, then for every chunk the input coordinates as text lines
+        and the longitude and latitude arrays in degrees.
+
+    Notes
+    -------
+        Requires astropy.
+
+    """
+    from astropy.io import fits
+
+    with fits.open(input_path, memmap=True) as hdul:
+        table = hdul[hdu].data
+
+        yield f'{lon_column}{delimiter}{lat_column}'
+
+        for start in range(0, len(table), chunk_size):
+            rows = table[start:start + chunk_size]
+            lon = np.asarray(rows[lon_column], dtype=float)
+            lat = np.asarray(rows[lat_column], dtype=float)
+
+            lines = np.char.add(np.char.add(lon.astype(str), delimiter), lat.astype(str))
+
+            yield lines.tolist(), lon, lat
+
+
+def _convert_chunk(chunk: Chunk, from_frame: str, to_frame: str,
+                   delimiter: str, precision: int, from_epoch: frames.Epoch,
+                   to_epoch: frames.Epoch) -> str:
+    """Convert one chunk and render it as CSV text."""
+    lines, lon, lat = chunk
+
+    lon, lat = frames.transform(lon, lat, from_frame, to_frame, from_epoch=from_epoch,
+                                to_epoch=to_epoch)
+
+    _lon, _lat = [np.char.mod(f'%.{precision}f', i) for i in [lon, lat]]
+
+    return ''.join(f'{i}{delimiter}{j}{delimiter}{k}\n' for i, j, k in
+                   zip(lines, _lon, _lat))
+
+
+def convert_catalog(input_path: str,
+                    output_path: str,
+                    from_frame: str = 'equatorial',
+                    to_frame: str = 'galactic',
+                    lon_column: str = 'ra',
+                    lat_column: str = 'dec',
+                    chunk_size: int = 100_000,
+                    delimiter: str = ',',
+                    sexagesimal: bool = False,
+                    precision: int = 8,
+                    overlap: bool = False,
+                    from_epoch: frames.Epoch = None,
+                    to_epoch: frames.Epoch = None) -> int:
+    """
+    Stream a catalog through a frame conversion, chunk by chunk.
+
+    Parameters
+    ----------
+    input_path : str
+        Path of the input catalog, CSV or FITS (by the .fits/.fit/.fits.gz extension).
+    output_path : str
+        Path of the output CSV. Every input line is written back with the converted
+        longitude and latitude appended.
+    from_frame : str, optional
+        Frame of the input coordinates. The default is 'equatorial'.
+    to_frame : str, optional
+        Frame of the output coordinates. The default is 'galactic'.
+    lon_column : str, optional
+        Name of the longitude-like input column. The default is 'ra'.
+    lat_column : str, optional
+        Name of the latitude-like input column. The default is 'dec'.
+    chunk_size : int, optional
+        Number of rows held in memory per chunk. The default is 100_000.
+    delimiter : str, optional
+        Column delimiter. The default is ','.
+    sexagesimal : bool, optional
+        Whether the CSV coordinate columns are HMS/DMS strings. The default is False.
+    precision : int, optional
+        Number of decimals of the output angles. The default is 8.
+    overlap : bool, optional
+        Whether to overlap reading, converting and writing in separate threads. The
+        default is False.
+    from_epoch : frames.Epoch, optional
+        Equinox of equatorial or ecliptic input coordinates. The default is None, for
+        J2000.
+    to_epoch : frames.Epoch, optional
+        Equinox of equatorial or ecliptic output coordinates. The default is None.
+
+    Returns
+    -------
+    int
+        Number of rows converted.
+
+    Notes
+    -------
+        At most three chunks are alive at any time, so the peak memory depends on
+        chunk_size and not on the size of the catalog.
+
+    """
+    if input_path.lower().endswith(('.fits', '.fit', '.fits.gz')):
+        chunks = read_fits_chunks(input_path, lon_column, lat_column, chunk_size,
+                                  delimiter=delimiter)
+    else:
+        lon_type = 'hms' if from_frame.lower() == 'equatorial' else 'dms'
+        chunks = read_csv_chunks(input_path, lon_column, lat_column, chunk_size,
+                                 delimiter, sexagesimal, lon_type)
+
+    _names = delimiter.join(OUTPUT_COLUMNS[frames._check_frame(to_frame)])
+    args = from_frame, to_frame, delimiter, precision, from_epoch, to_epoch
+    n_rows = 0
+
+    with open(output_path, 'w') as _out:
+        _out.write(f'{next(chunks)}{delimiter}{_names}\n')
+
+        if not overlap:
+            for chunk in chunks:
+                n_rows += chunk[1].size
+                _out.write(_convert_chunk(chunk, *args))
+
+            return n_rows
+
+        # one thread converts chunk i while another writes chunk i - 1 and the main
+        # thread reads chunk i + 1
+        with ThreadPoolExecutor(1) as _compute, ThreadPoolExecutor(1) as _write:
+            converting, writing = None, None
+
+            for chunk in chunks:
+                n_rows += chunk[1].size
+                _next = _compute.submit(_convert_chunk, chunk, *args)
+
+                if converting is not None:
+                    _text = converting.result()
+                    if writing is not None:
+                        writing.result()
+                    writing = _write.submit(_out.write, _text)
+
+                converting = _next
+
+            if writing is not None:
+                writing.result()
+            if converting is not None:
+                _out.write(converting.result())
+
+    return n_rows
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description='Convert the coordinates of a CSV/FITS catalog between frames, '
+                    'streaming it in chunks.')
+    parser.add_argument('input_path')
+    parser.add_argument('output_path')
+    parser.add_argument('--from', dest='from_frame', default='equatorial',
+                        choices=frames.FRAMES)
+    parser.add_argument('--to', dest='to_frame', default='galactic',
+                        choices=frames.FRAMES)
+    parser.add_argument('--lon-column', default='ra')
+    parser.add_argument('--lat-column', default='dec')
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--delimiter', default=',')
+    parser.add_argument('--sexagesimal', action='store_true',
+                        help='the coordinate columns are HMS/DMS strings')
+    parser.add_argument('--precision', type=int, default=8)
+    parser.add_argument('--overlap', action='store_true',
+                        help='overlap reading, converting and writing')
+    parser.add_argument('--from-epoch', help='equinox of the input, e.g. B1950')
+    parser.add_argument('--to-epoch', help='equinox of the output, e.g. J2025.0')
+
+    args = parser.parse_args(argv)
+
+    n_rows = convert_catalog(**vars(args))
+    print(f'Converted {n_rows} rows to {args.output_path}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -2,16 +2,43 @@
 Created on Sat Apr 10 15:29:25 2021
 """
 
+from functools import partial
 from typing import Tuple, Union
 
 import numpy as np
 
 import conversion_utilities as utils
+import diagnostics
+import fast_trig
+import frames
+from caching import lru_cache
 from conversion_errors import IncompleteArguments, OutputTypeError
 
 FloatStr = Union[float, str]
+FloatStrArr = utils.FloatStrArr
+np_arr = utils.np_arr
 
-_long_ncp = np.radians([122.93192])
+@lru_cache('observer_terms', maxsize=256)
+def _observer_terms(latitude: float) -> Tuple[float, float]:
+    """sin and cos of an observer latitude in degrees."""
+    latitude = np.radians(latitude)
+
+    return np.sin(latitude), np.cos(latitude)
+
+
+def _format_angles(angles, formats, output_type: type) -> tuple:
+    """
+    Angles in degrees as they are for float output, or formatted by dd2hms_array
+    ('hms') or dd2dms_array ('dms'). Scalars go through the array formatters too, so
+    that a value is written the same way whatever the shape of the input.
+    """
+    if output_type == float:
+        return tuple(angles)
+
+    _formatters = {'hms': utils.dd2hms_array, 'dms': utils.dd2dms_array}
+    angles = [_formatters[j](np.asarray(i)) for i, j in zip(angles, formats)]
+
+    return tuple(i.item() if i.ndim == 0 else i for i in angles)
 
 
 def equatorial2horizontal(observer_latitude: FloatStr,
@@ -64,8 +91,9 @@ def equatorial2horizontal(observer_latitude: FloatStr,
                               ' or \'zenith angle\'.')
 
     if None not in [right_ascension, hour_angle]:
-        print('Both right_ascension and hour_angle parameters are provided.\n'
-              'Using hour_angle for calculations.')
+        diagnostics.report('hour_angle_preferred',
+                           'Both right_ascension and hour_angle parameters are provided.\n'
+                           'Using hour_angle for calculations.')
         hour_angle = utils.change_instance(hour_angle, 'hms')
 
     if right_ascension is None and hour_angle is None:
@@ -77,22 +105,22 @@ def equatorial2horizontal(observer_latitude: FloatStr,
                                   'local_time argument')
 
     if hour_angle is None:
-        hour_angle = utils.RA2HA(right_ascension, local_time)
-        hour_angle = utils.change_instance(hour_angle, 'hms')
+        hour_angle = utils.ra2ha(right_ascension, local_time)
     else:
         hour_angle = utils.change_instance(hour_angle, 'hms')
 
-    latitude, hour_angle, declination = np.radians([latitude, hour_angle, declination])
+    sin_lat, cos_lat = _observer_terms(latitude)
+    hour_angle, declination = np.radians([hour_angle, declination])
 
-    x = -np.sin(latitude) * np.cos(declination) * np.cos(hour_angle)
-    x += np.cos(latitude) * np.sin(declination)
+    x = -sin_lat * np.cos(declination) * np.cos(hour_angle)
+    x += cos_lat * np.sin(declination)
 
     y = np.cos(declination) * np.sin(hour_angle)
 
     azimuth = np.degrees(-np.arctan2(y, x))
 
-    altitude = np.sin(latitude) * np.sin(declination)
-    altitude += np.cos(latitude) * np.cos(declination) * np.cos(hour_angle)
+    altitude = sin_lat * np.sin(declination)
+    altitude += cos_lat * np.cos(declination) * np.cos(hour_angle)
 
     altitude = np.degrees(np.arcsin(altitude))
 
@@ -106,42 +134,172 @@ def equatorial2horizontal(observer_latitude: FloatStr,
     return azimuth, alt
 
 
-def horizontal2equatorial(observer_latitude: FloatStr,
-                          azimuth: FloatStr,
-                          altitude: FloatStr = None,
-                          local_time: FloatStr = None,
-                          zenith_angle: FloatStr = None,
-                          out: str = 'ha'):
+def equatorial2horizontal_array(observer_latitude: FloatStrArr,
+                                declination: FloatStrArr,
+                                right_ascension: FloatStrArr = None,
+                                hour_angle: FloatStrArr = None,
+                                local_time: FloatStrArr = None,
+                                output_parameter: str = 'altitude',
+                                output_type: type = float,
+                                dtype: type = np.float64,
+                                approximate: bool = False) -> Tuple[np_arr, np_arr]:
+    """
+    Convert arrays of equatorial coordinates to horizontal coordinates in one pass.
+
+    Parameters
+    ----------
+    observer_latitude : FloatStrArr
+        Latitude(s) of the observer.
+    declination : FloatStrArr
+        Declination(s) of the celestial objects.
+    right_ascension : FloatStrArr, optional
+        Right ascension(s) of the celestial objects. The default is None.
+    hour_angle : FloatStrArr, optional
+        Hour angle(s) of the celestial objects. The default is None.
+    local_time : FloatStrArr, optional
+        Local time(s) for the observer. The default is None.
+    output_parameter : str, optional
+        Whether to give altitude or zenith angle as output. The default is 'altitude'.
+    output_type : type, optional
+        Whether the output should be in float or DMS string arrays. The default is
+        float.
+    dtype : type, optional
+        Floating point precision of the computation, np.float64 or np.float32. The
+        default is np.float64.
+    approximate : bool, optional
+        Whether to use the fast_trig kernels for float64, which make the conversion
+        about twice as fast and stay within fast_trig.MAX_ERROR_ARCSEC of the exact
+        results. Meant for displays, not for science. It has no effect with
+        np.float32, whose exact kernels are already the fast ones. The default is
+        False.
+
+    Raises
+    ------
+    OutputTypeError
+        Raised if the output parameter is not 'altitude', 'zenith', or 'zenith angle',
+        or if the output type is neither str nor float.
+    IncompleteArguments
+        Raised if the argument set is not complete.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr]
+        Azimuth and altitude/zenith angle arrays, broadcast against each other.
+
+    Notes
+    -------
+        All inputs are broadcast together. If both hour_angle and right_ascension are
+        given, hour_angle is used.
+
+    """
+    output_parameter = output_parameter.lower()
+
+    if output_parameter not in ['altitude', 'zenith', 'zenith angle']:
+        raise OutputTypeError('The output type must either be \'altitude\', \'zenith\','
+                              ' or \'zenith angle\'.')
+
+    if output_type not in [str, float]:
+        raise OutputTypeError('The output_type parameter must either be str or float.')
+
+    if hour_angle is None:
+        if right_ascension is None:
+            raise IncompleteArguments('Either right_ascension or hour_angle must be '
+                                      'provided.')
+
+        if local_time is None:
+            raise IncompleteArguments('right_ascension argument must be passed with '
+                                      'local_time argument')
+
+        hour_angle = utils.ra2ha(right_ascension, local_time)
+    else:
+        hour_angle = utils.change_instance_array(hour_angle, 'hms')
+
+    latitude, declination = [utils.change_instance_array(i) for i in
+                             [observer_latitude, declination]]
+
+    latitude, hour_angle, declination = [np.radians(np.asarray(i, dtype=dtype)) for i in
+                                         [latitude, hour_angle, declination]]
+
+    # the exact float32 kernels are already the fast ones, and fast_trig would only
+    # add its argument reduction
+    if approximate and np.dtype(dtype) != np.float32:
+        sin_cos, hypot = partial(fast_trig.sin_cos, dtype=dtype), fast_trig.hypot
+    else:
+        sin_cos, hypot = lambda i: (np.sin(i), np.cos(i)), np.hypot
+
+    sin_lat, cos_lat = sin_cos(latitude)
+    sin_dec, cos_dec = sin_cos(declination)
+    sin_ha, cos_ha = sin_cos(hour_angle)
+
+    x = cos_lat * sin_dec - sin_lat * cos_dec * cos_ha
+    y = cos_dec * sin_ha
+
+    azimuth = np.degrees(-np.arctan2(y, x))
+
+    # arctan2 rather than arcsin, which loses precision near the zenith
+    altitude = np.degrees(np.arctan2(sin_lat * sin_dec + cos_lat * cos_dec * cos_ha,
+                                     hypot(x, y)))
+
+    alt = altitude if output_parameter == 'altitude' else utils.altitude2zenith(altitude)
+
+    azimuth = np.where(latitude < 0, 180 - azimuth, azimuth)
+
+    if output_type == str:
+        azimuth, alt = [utils.dd2dms_array(i) for i in [azimuth, alt]]
+
+    return azimuth, alt
+
+
+def horizontal2equatorial(observer_latitude: FloatStrArr,
+                          azimuth: FloatStrArr,
+                          altitude: FloatStrArr = None,
+                          local_time: FloatStrArr = None,
+                          zenith_angle: FloatStrArr = None,
+                          out: str = 'ha',
+                          output_type: type = str) -> Union[Tuple[str, str],
+                                                            Tuple[float, float],
+                                                            Tuple[np_arr, np_arr]]:
     """
     Convert the given horizontal coordinates to equatorial coordinates.
 
     Parameters
     ----------
-    observer_latitude : FloatStr
-        Latitude of the observer.
-    azimuth : FloatStr
-        Azimuth value for the celestial object.
-    altitude : FloatStr
-        Altitude value for the celestial object.
-    local_time : FloatStr, optional
-        Local time for the observer. If specified, the output will be changed to RA.
+    observer_latitude : FloatStrArr
+        Latitude(s) of the observer.
+    azimuth : FloatStrArr
+        Azimuth value(s) for the celestial object(s).
+    altitude : FloatStrArr
+        Altitude value(s) for the celestial object(s).
+    local_time : FloatStrArr, optional
+        Local time(s) for the observer. If specified, the output will be changed to RA.
         The default is None.
-    zenith_angle : FloatStr, optional
-        Zenith angle for the celestial object. If specified, it will be given preference
-        over the altitude. The default is None.
+    zenith_angle : FloatStrArr, optional
+        Zenith angle(s) for the celestial object(s). If specified, it will be given
+        preference over the altitude. The default is None.
     out : str, optional
         Whether to give hour angle or right ascension as the output. The default is
-        'ha'. The default is 'ha'.
+        'ha'.
+    output_type : type, optional
+        Whether the output should be in HMS/DMS strings or degree floats. The default is
+        str.
 
     Raises
     ------
     OutputTypeError
-        Raised if the output type is not in 'ra', 'ha', 'right ascension' or hour angle'.
+        Raised if the output type is not in 'ra', 'ha', 'right ascension' or hour angle',
+        or if output_type is neither str nor float.
 
     Returns
     -------
-    Tuple[str, str]
-        Equatorial coordinates of the celestial object.
+    Union[Tuple[str, str], Tuple[float, float], Tuple[np_arr, np_arr]]
+        Equatorial coordinates of the celestial object(s). Array inputs give arrays,
+        broadcast against each other.
+
+    Notes
+    -------
+        Azimuths follow the convention of equatorial2horizontal_array, so that this
+        function is its inverse in both hemispheres, whether altitude or zenith_angle
+        is given.
 
     """
 
@@ -149,179 +307,195 @@ def horizontal2equatorial(observer_latitude: FloatStr,
         raise OutputTypeError('The output type must either be \'ra\', \'ha\', '
                               '\'right ascension\' or \'hour angle\'.')
 
+    if output_type not in [str, float]:
+        raise OutputTypeError('The output_type parameter must either be str or float.')
+
     if local_time is not None:
         if out.lower() in ['ha', 'hour angle']:
-            print('local_time defined. The output will be changed to RA value.')
+            diagnostics.report('output_changed_to_ra',
+                               'local_time defined. The output will be changed to RA '
+                               'value.')
             out = 'ra'
 
     if altitude is None and zenith_angle is None:
         raise IncompleteArguments('Either zenith_angle or altitude must be provided.')
 
-    lat, az, alt = [utils.change_instance(i, 'dms') for i in [observer_latitude, azimuth,
-                                                              altitude]]
+    lat, az = [utils.change_instance_array(i) for i in [observer_latitude, azimuth]]
+
+    if altitude is not None and zenith_angle is not None:
+        diagnostics.report('zenith_angle_preferred',
+                           'Both zenith_angle and altitude parameters are provided.\n'
+                           'Using zenith_angle for calculations.')
 
-    if None not in [altitude, zenith_angle]:
-        print('Both zenith_angle and altitude parameters are provided.\n'
-              'Using zenith_angle for calculations.')
-        zenith_angle = utils.change_instance(zenith_angle, 'dms')
+    if zenith_angle is not None:
+        zenith_angle = utils.change_instance_array(zenith_angle)
     else:
-        zenith_angle = utils.altitude2zenith(alt)
+        zenith_angle = utils.altitude2zenith(utils.change_instance_array(altitude))
 
-        zenith_angle = -zenith_angle if lat < 0 else zenith_angle
+    # southern azimuths are measured as 180 - azimuth by equatorial2horizontal, which
+    # the sign of the zenith angle undoes
+    zenith_angle = np.where(lat < 0, -zenith_angle, zenith_angle)
 
-    _conv = [np.radians(i) for i in [zenith_angle, az, lat]]
+    scalar = all(np.ndim(i) == 0 for i in [lat, az, zenith_angle])
 
-    zenith_angle, azimuth, latitude = _conv
+    zenith_angle, azimuth, latitude = [np.radians(i) for i in [zenith_angle, az, lat]]
 
     declination = np.sin(latitude) * np.cos(zenith_angle)
     declination += np.cos(latitude) * np.sin(zenith_angle) * np.cos(azimuth)
 
-    declination = np.arcsin(declination)
+    declination = np.arcsin(np.clip(declination, -1, 1))
 
     _num = np.cos(zenith_angle) - np.sin(latitude) * np.sin(declination)
     _den = np.cos(latitude) * np.cos(declination)
 
-    _ha = np.arccos(_num / _den)
+    # rounding can push the ratio just past +-1 at hour angles of 0 and 180 degrees
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _ha = np.arccos(np.clip(_num / _den, -1, 1))
 
-    hour_angle = 2 * np.pi - _ha if np.logical_or(latitude > 0 > declination,
-                                                  latitude < 0 < declination) else _ha
+    # arccos only gives hour angles in [0, pi]; objects east of the meridian, with
+    # sin(azimuth) > 0 in the azimuth convention of equatorial2horizontal, have hour
+    # angles in (pi, 2pi)
+    hour_angle = np.where(np.sin(azimuth) > 0, 2 * np.pi - _ha, _ha)
 
-    declination, hour_angle = np.degrees([declination, hour_angle])
+    declination, hour_angle = np.degrees(declination), np.degrees(hour_angle)
 
     if out in ['ra', 'right ascension']:
-        hour_angle = utils.HA2RA(hour_angle=hour_angle, local_time=local_time)
+        hour_angle = utils.ha2ra(hour_angle=hour_angle, local_time=local_time)
+        scalar &= np.ndim(hour_angle) == 0
 
-    return utils.dd2hms(hour_angle), utils.dd2dms(declination)
+    if scalar:
+        hour_angle, declination = float(hour_angle), float(declination)
+    else:
+        hour_angle, declination = [i.copy() for i in
+                                   np.broadcast_arrays(hour_angle, declination)]
+
+    return _format_angles([hour_angle, declination], ['hms', 'dms'], output_type)
 
 
-def equatorial2ecliptic(right_ascension: FloatStr,
-                        declination: FloatStr,
+def equatorial2ecliptic(right_ascension: FloatStrArr,
+                        declination: FloatStrArr,
                         output_type: type = str,
                         ecliptic: FloatStr = 23.43927944) -> Union[Tuple[str, str],
-                                                                   Tuple[float, float]]:
+                                                                   Tuple[float, float],
+                                                                   Tuple[np_arr, np_arr]]:
     """
     Convert equatorial coordinates of an object to corresponding ecliptic coordinates.
 
     Parameters
     ----------
-    right_ascension : FloatStr
-        Right ascension of the celestial object.
-    declination : FloatStr
-        Declination of the celestial object.
+    right_ascension : FloatStrArr
+        Right ascension(s) of the celestial object(s).
+    declination : FloatStrArr
+        Declination(s) of the celestial object(s).
     output_type : type, optional
         Whether the output should be in string format DMS or in degree decimal.
         The default is str.
     ecliptic : FloatStr, optional
         The value for the obliquity of the ecliptic. The default is 23.43927944.
 
+    Raises
+    -------
+    OutputTypeError:
+        Raised when the output_type parameter is neither str nor float type.
+
     Returns
     -------
-    Union[Tuple[str, str], Tuple[float, float]]
-        The ecliptic coordinates of the given equatorial coordinates.
+    Union[Tuple[str, str], Tuple[float, float], Tuple[np_arr, np_arr]]
+        The ecliptic (lat, long) of the given equatorial coordinates, with the
+        longitude in [0, 360).
 
+    Notes
+    -------
+        The conversion is frames.rotate with the cached frames.rotation_matrix, so it
+        agrees with frames.transform.
 
     """
+    if output_type not in [str, float]:
+        raise OutputTypeError('The output_type parameter must either be str or float.')
 
-    ra = utils.change_instance(right_ascension, 'hms')
-    dec = utils.change_instance(declination)
-    ecliptic = utils.change_instance(ecliptic)
-
-    ra, dec, ecliptic = [np.radians(i) for i in [ra, dec, ecliptic]]
-
-    lat = np.sin(dec) * np.cos(ecliptic)
-    lat -= np.cos(dec) * np.sin(ecliptic) * np.sin(ra)
-
-    lat = np.arcsin(lat)
-
-    _num = np.sin(ra) * np.cos(ecliptic)
-    _num += np.tan(dec) * np.sin(ecliptic)
-
-    _den = np.cos(ra)
-
-    long = np.arctan2(_num, _den)
-
-    lat, long = np.degrees([lat, long])
+    ra = utils.change_instance_array(right_ascension, 'hms')
+    dec = utils.change_instance_array(declination)
 
-    if output_type == str:
-        lat, long = utils.dd2dms(lat), utils.dd2dms(long)
+    _matrix = frames.rotation_matrix('equatorial', 'ecliptic',
+                                     utils.change_instance(ecliptic))
+    long, lat = frames.rotate(ra, dec, _matrix)
 
-    return lat, long
+    return _format_angles([lat, long], ['dms', 'dms'], output_type)
 
 
-def ecliptic2equatorial(latitude: FloatStr,
-                        longitude: FloatStr,
+def ecliptic2equatorial(latitude: FloatStrArr,
+                        longitude: FloatStrArr,
                         output_type: type = str,
                         ecliptic: FloatStr = 23.43927944) -> Union[Tuple[str, str],
-                                                                   Tuple[float, float]]:
+                                                                   Tuple[float, float],
+                                                                   Tuple[np_arr, np_arr]]:
     """
     Convert ecliptic coordinates of an object to corresponding equatorial coordinates.
 
 
     Parameters
     ----------
-    latitude : FloatStr
-        Latitude of the celestial object.
-    longitude : FloatStr
-        Longitude of the celestial object.
+    latitude : FloatStrArr
+        Latitude(s) of the celestial object(s).
+    longitude : FloatStrArr
+        Longitude(s) of the celestial object(s).
     output_type : type, optional
-        Whether the output should be in string format DMS or in degree decimal.
+        Whether the output should be in string format HMS/DMS or in degree decimal.
         The default is str.
     ecliptic : FloatStr, optional
         The value for the obliquity of the ecliptic. The default is 23.43927944.
 
-    Returns
+    Raises
     -------
-    Union[Tuple[str, str], Tuple[float, float]]
-        The ecliptic coordinates of the given equatorial coordinates.
-
-    """
-    lat = utils.change_instance(latitude)
-    long = utils.change_instance(longitude)
-    ecliptic = utils.change_instance(ecliptic)
-
-    lat, long, ecliptic = np.radians([lat, long, ecliptic])
-
-    dec = np.sin(lat) * np.cos(ecliptic)
-    dec += np.cos(lat) * np.sin(ecliptic) * np.sin(long)
-
-    dec = np.arcsin(dec)
+    OutputTypeError:
+        Raised when the output_type parameter is neither str nor float type.
 
-    _num = np.sin(long) * np.cos(ecliptic)
-    _num -= np.tan(lat) * np.sin(ecliptic)
+    Returns
+    -------
+    Union[Tuple[str, str], Tuple[float, float], Tuple[np_arr, np_arr]]
+        The equatorial (RA, Dec) of the given ecliptic coordinates, with the RA in
+        [0, 360).
 
-    _den = np.cos(long)
+    Notes
+    -------
+        The conversion is frames.rotate with the cached frames.rotation_matrix, so it
+        agrees with frames.transform.
 
-    _ra = np.arctan2(_num, _den)
+    """
+    if output_type not in [str, float]:
+        raise OutputTypeError('The output_type parameter must either be str or float.')
 
-    ra, dec = np.degrees([_ra, dec])
+    lat, long = [utils.change_instance_array(i) for i in [latitude, longitude]]
 
-    if output_type == str:
-        ra, dec = utils.dd2hms(ra), utils.dd2dms(dec)
+    _matrix = frames.rotation_matrix('ecliptic', 'equatorial',
+                                     utils.change_instance(ecliptic))
+    ra, dec = frames.rotate(long, lat, _matrix)
 
-    return ra, dec
+    return _format_angles([ra, dec], ['hms', 'dms'], output_type)
 
 
-def equatorial2galactic(right_ascension: FloatStr,
-                        declination: FloatStr,
+def equatorial2galactic(right_ascension: FloatStrArr,
+                        declination: FloatStrArr,
                         output_type: type = str,
                         _ra_gal: float = 192.85948,
                         _dec_gal: float = 27.12825) -> Union[Tuple[str, str],
-                                                             Tuple[float, float]]:
+                                                             Tuple[float, float],
+                                                             Tuple[np_arr, np_arr]]:
     """
     Convert equatorial coordinates of a celestial object to galactic coordinates.
 
     Parameters
     ----------
-    right_ascension : FloatStr,
-        Right ascension of the celestial body.
-    declination : FloatStr
-        Declination of the celestial body.
+    right_ascension : FloatStrArr,
+        Right ascension(s) of the celestial body.
+    declination : FloatStrArr
+        Declination(s) of the celestial body.
     output_type : str
         Whether the output should be a string of DMS or in degree decimal format.
     _ra_gal : float
-        Right ascension value for the galactic center. The default is 192.85948.
+        Right ascension value for the North Galactic Pole. The default is 192.85948.
     _dec_gal : float
-        Declination value for the galactic center. The default is 27.12825.
+        Declination value for the North Galactic Pole. The default is 27.12825.
 
     Raises
     -------
@@ -330,54 +504,47 @@ def equatorial2galactic(right_ascension: FloatStr,
 
     Returns
     -------
-    Union[Tuple[str, str], Tuple[float, float]]
-        Galactic coordinates (lat, long) of the input equatorial coordinates.
+    Union[Tuple[str, str], Tuple[float, float], Tuple[np_arr, np_arr]]
+        Galactic coordinates (long, lat) of the input equatorial coordinates, the
+        galactic longitude l in [0, 360) being 0 towards the galactic centre.
 
-    """
-    ra = utils.change_instance(right_ascension, 'hms')
-    dec = utils.change_instance(declination)
+    Notes
+    -------
+        The conversion is frames.rotate with the cached frames.rotation_matrix, so it
+        agrees with frames.transform.
 
+    """
     if output_type not in [str, float]:
         raise OutputTypeError('The output_type parameter must either be str or float.')
 
-    ra, dec, _ra_gal, _dec_gal = np.radians([ra, dec, _ra_gal, _dec_gal])
-
-    _num = np.cos(dec) * np.sin(ra - _ra_gal)
+    ra = utils.change_instance_array(right_ascension, 'hms')
+    dec = utils.change_instance_array(declination)
 
-    _den = np.sin(dec) * np.cos(_dec_gal)
-    _den -= np.cos(dec) * np.sin(_dec_gal) * np.cos(ra - _ra_gal)
+    _matrix = frames.rotation_matrix('equatorial', 'galactic',
+                                     galactic_pole=(_ra_gal, _dec_gal))
+    long, lat = frames.rotate(ra, dec, _matrix)
 
-    long = np.arctan2(_num, _den)
+    return _format_angles([long, lat], ['dms', 'dms'], output_type)
 
-    lat = np.sin(dec) * np.sin(_dec_gal)
-    lat += np.cos(dec) * np.cos(_dec_gal) * np.cos(ra - _ra_gal)
 
-    lat = np.arcsin(lat)
-
-    long, lat = np.degrees([long, lat])
-
-    if output_type == str:
-        long, lat = [utils.dd2dms(i) for i in [long, lat]]
-
-    return long, lat
-
-
-def galactic2equatorial(galactic_latitude: FloatStr,
-                        galactic_longitude: FloatStr,
+def galactic2equatorial(galactic_latitude: FloatStrArr,
+                        galactic_longitude: FloatStrArr,
                         output_type: type = str,
                         _ra_ngp: float = 192.85948,
                         _dec_ngp: float = 27.12825) -> Union[Tuple[str, str],
-                                                             Tuple[float, float]]:
+                                                             Tuple[float, float],
+                                                             Tuple[np_arr, np_arr]]:
     """
-    Convert the equatorial coordinates of a celestial object to their galactic
+    Convert the galactic coordinates of a celestial object to their equatorial
     counterparts.
 
     Parameters
     ----------
-    galactic_latitude : FloatStr
-        Galactic latitude of the celestial object.
-    galactic_longitude :
-        Galactic longitude of the celestial object
+    galactic_latitude : FloatStrArr
+        Galactic latitude(s) of the celestial object(s).
+    galactic_longitude : FloatStrArr
+        Galactic longitude(s) of the celestial object(s), 0 towards the galactic
+        centre.
     output_type : type
         Whether the equatorial coordinates should be in HMS/DMS string format or degree
         decimal format.
@@ -393,32 +560,25 @@ def galactic2equatorial(galactic_latitude: FloatStr,
 
     Returns
     -------
-    Union[Tuple[str, str], Tuple[float, float]]
-        Equatorial coordinates (RA, Dec) for the input galactic coordinates.
+    Union[Tuple[str, str], Tuple[float, float], Tuple[np_arr, np_arr]]
+        Equatorial coordinates (RA, Dec) for the input galactic coordinates, with the
+        RA in [0, 360).
+
+    Notes
+    -------
+        The conversion is frames.rotate with the cached frames.rotation_matrix, so it
+        agrees with frames.transform.
 
     """
 
     if output_type not in [str, float]:
         raise OutputTypeError('The output_type parameter must either be str or float.')
 
-    b, long = [utils.change_instance(i) for i in [galactic_latitude, galactic_longitude]]
-
-    b, long, _ra_ngp, _dec_ngp = np.radians([b, long, _ra_ngp, _dec_ngp])
-
-    dec = np.sin(_dec_ngp) * np.sin(b)
-    dec += np.cos(_dec_ngp) * np.cos(b) * np.cos(_long_ncp - long)
-
-    dec = np.arcsin(dec)
+    b, long = [utils.change_instance_array(i) for i in
+               [galactic_latitude, galactic_longitude]]
 
-    _num = np.cos(b) * np.sin(_long_ncp - long)
-    _den = np.cos(_dec_ngp) * np.sin(b)
-    _den -= np.sin(_dec_ngp) * np.cos(b) * np.cos(_long_ncp - long)
-
-    ra = np.arctan2(_num, _den)
-
-    ra, dec = np.degrees([ra, dec])
-
-    if output_type == str:
-        ra, dec = utils.dd2hms(ra), utils.dd2dms(dec)
+    _matrix = frames.rotation_matrix('galactic', 'equatorial',
+                                     galactic_pole=(_ra_ngp, _dec_ngp))
+    ra, dec = frames.rotate(long, b, _matrix)
 
-    return ra, dec
+    return _format_angles([ra, dec], ['hms', 'dms'], output_type)
@@ -13,3 +13,7 @@ class OutputTypeError(BaseErrorClass):
 
 class IncompleteArguments(BaseErrorClass):
     pass
+
+
+class UnknownFrame(BaseErrorClass):
+    pass
@@ -1,10 +1,13 @@
 """
 Created on Apr 14 23:59:42 2022
 """
-from typing import Union
+from typing import Tuple, Union
 
 import numpy as np
 
+import diagnostics
+from caching import lru_cache
+
 np_arr = np.ndarray
 
 FloatStr = Union[float, str]
@@ -36,6 +39,69 @@ def change_instance(in_obj: FloatStr, in_type: str = 'dms') -> float:
     return out
 
 
+def change_instance_array(in_obj, in_type: str = 'dms') -> np_arr:
+    """
+    Convert a scalar, sequence or array of DMS/HMS strings or floats to a float array.
+
+    Parameters
+    ----------
+    in_obj :
+        Input values, either numeric or DMS/HMS strings.
+    in_type : str, optional
+        Type of conversion for string inputs. The default is 'dms'.
+
+    Returns
+    -------
+    np_arr
+        Degree decimal values as a float64 array with the shape of the input.
+
+    """
+    if isinstance(in_obj, str):
+        return np.asarray(change_instance(in_obj, in_type), dtype=float)
+
+    if isinstance(in_obj, (list, tuple)):
+        # mixed lists of floats and strings must keep their element types
+        try:
+            _arr = np.asarray(in_obj, dtype=float)
+        except (TypeError, ValueError):
+            _arr = np.asarray(in_obj, dtype=object)
+    else:
+        _arr = np.asarray(in_obj)
+
+    if _arr.dtype.kind in 'US':
+        _arr, _ = dms2dd_array(_arr) if in_type == 'dms' else hms2dd_array(_arr)
+    elif _arr.dtype.kind == 'O':
+        _flat = [change_instance(i, in_type) for i in _arr.ravel()]
+        _arr = np.array(_flat, dtype=float).reshape(_arr.shape)
+
+    return _arr.astype(float, copy=False)
+
+
+def _change_instance_angle(in_obj, in_type: str = 'hms',
+                           deg_rad: bool = True) -> np_arr:
+    """
+    change_instance_array for angles in degrees or radians: strings are always parsed
+    to degrees, so in radian mode they are converted while floats are kept as given.
+    """
+    if deg_rad or isinstance(in_obj, str):
+        _arr = change_instance_array(in_obj, in_type)
+
+        return _arr if deg_rad else np.radians(_arr)
+
+    try:
+        return np.asarray(in_obj, dtype=float)
+    except (TypeError, ValueError):
+        _arr = np.asarray(in_obj, dtype=object)
+
+    if _arr.dtype.kind in 'US':
+        return np.radians(change_instance_array(_arr, in_type))
+
+    _flat = [np.radians(change_instance(i, in_type)) if isinstance(i, str) else i
+             for i in _arr.ravel()]
+
+    return np.array(_flat, dtype=float).reshape(_arr.shape)
+
+
 def altitude2zenith(altitude: FloatStrArr, deg_rad: bool = True) -> float:
     """
     Convert the given altitude to its complementary zenith angle.
@@ -100,19 +166,201 @@ def dms2dd(dms: str) -> float:
 
     Notes
     -------
-        List conversion is possible
+        List conversion is possible. A negative sign applies to the whole value, so
+        '-00:30:00' gives -0.5.
 
     """
 
+    return _parse_dms(dms)
+
+
+@lru_cache('dms2dd')
+def _parse_dms(dms: str) -> float:
     deg, minute, sec = [float(j) for j in dms.split(':')]
 
-    # check for negative degree value
-    if deg < 0:
+    # check for negative degree value, from the sign so that -00 is negative too
+    if dms.lstrip().startswith('-'):
         minute, sec = float(f'-{minute}'), float(f'-{sec}')
 
     return deg + minute / 60 + sec / 3600
 
 
+def _sexagesimal_fields(values) -> Tuple[np_arr, np_arr, np_arr]:
+    """
+    Parse an array of 'X:MM:SS.s' strings into its three fields in a single pass.
+
+    Parameters
+    ----------
+    values :
+        Array-like of sexagesimal strings (str, bytes or object dtype).
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr, np_arr]
+        (fields, negative, valid), where fields has shape (3, N) and holds the absolute
+        values of the three fields, negative flags a leading '-' sign and valid flags
+        the well-formed rows.
+
+    Notes
+    -------
+        The strings are viewed as a byte matrix and the only Python loops run over the
+        string width, never over the rows.
+
+    """
+    _arr = np.asarray(values)
+
+    if _arr.dtype.kind == 'O':
+        _arr = _arr.astype(str)
+
+    _arr = np.ascontiguousarray(_arr.ravel())
+    n_rows = _arr.size
+
+    if _arr.dtype.kind == 'U':
+        # read the UCS4 code points directly, anything outside ASCII is malformed
+        width = _arr.dtype.itemsize // 4
+        codes = _arr.view(np.uint32).reshape(n_rows, width)
+        codes = np.where(codes < 128, codes, 1).astype(np.uint8)
+    else:
+        width = _arr.dtype.itemsize
+        codes = _arr.view(np.uint8).reshape(n_rows, width)
+
+    # work on one contiguous row per character position, so that the reductions over
+    # the string width are element-wise operations between rows
+    codes = np.ascontiguousarray(codes.T)
+
+    blank = (codes == 0) | (codes == 32) | (codes == 9)
+    digit = (codes >= 48) & (codes <= 57)
+    dot = codes == 46
+    colon = codes == 58
+    sign = (codes == 43) | (codes == 45)
+
+    valid = np.all(blank | digit | dot | colon | sign, axis=0)
+    valid &= colon.sum(axis=0, dtype=np.uint8) == 2
+
+    # whitespace is only allowed as padding around each field, as float() reads them,
+    # and a sign may only be the first character of the value
+    filled = ~blank
+    _content = filled & ~colon
+    before, after = np.zeros_like(filled), np.zeros_like(filled)
+    field_before, field_after = np.zeros_like(filled), np.zeros_like(filled)
+    field = np.zeros(codes.shape, dtype=np.int8)
+
+    # running scans over the (short) string width, one whole row at a time, the
+    # field scans restarting at every colon
+    for j in range(1, width):
+        before[j] = before[j - 1] | filled[j - 1]
+        after[-j - 1] = after[-j] | filled[-j]
+        field_before[j] = _content[j - 1] | field_before[j - 1] & ~colon[j - 1]
+        field_after[-j - 1] = _content[-j] | field_after[-j] & ~colon[-j]
+        field[j] = field[j - 1] + colon[j - 1]
+
+    field += colon
+
+    valid &= ~np.any(blank & field_before & field_after, axis=0)
+    valid &= ~np.any(sign & before, axis=0)
+    negative = np.any(codes == 45, axis=0)
+
+    number = digit | dot
+
+    for _f in range(3):
+        _in_field = field == _f
+        valid &= np.any(digit & _in_field, axis=0)
+        valid &= (dot & _in_field).sum(axis=0, dtype=np.uint8) <= 1
+
+    fields = np.full((3, n_rows), np.nan)
+
+    for _f in range(3):
+        # blank out everything but the number in this field and let NumPy's C parser
+        # read the remaining fixed-width byte strings, cropped to the used positions
+        _mask = number & (field == _f) & valid
+        _used = np.flatnonzero(np.any(_mask, axis=1))
+
+        if _used.size == 0:
+            continue
+
+        _rows = slice(_used[0], _used[-1] + 1)
+        _codes = np.where(_mask[_rows], codes[_rows], 32).astype(np.uint8)
+        _codes[-1, ~valid] = 48
+
+        _codes = np.ascontiguousarray(_codes.T)
+        fields[_f] = _codes.view(f'S{_codes.shape[1]}').ravel().astype(float)
+
+    fields[:, ~valid] = np.nan
+
+    n_malformed = n_rows - np.count_nonzero(valid)
+    if n_malformed:
+        diagnostics.report('malformed_sexagesimal',
+                           f'{n_malformed} malformed sexagesimal strings were set to NaN.',
+                           n_malformed)
+
+    return fields, negative, valid
+
+
+def dms2dd_array(dms) -> Tuple[np_arr, np_arr]:
+    """
+    Convert an array of degree-minute-second strings to degree decimal in bulk.
+
+    Parameters
+    ----------
+    dms :
+        Array-like of strings in '[+-]DD:MM:SS.s' format.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr]
+        Degree decimal float64 array and the boolean mask of well-formed rows, both with
+        the shape of the input. Malformed rows are NaN.
+
+    Notes
+    -------
+        As in dms2dd, a negative degree value makes the minutes and seconds negative
+        as well. The sign is read from the string, so '-00:30:00' gives -0.5. Each
+        field may be padded with whitespace, as float() allows.
+
+    """
+    _shape = np.shape(dms)
+    fields, negative, valid = _sexagesimal_fields(dms)
+
+    out = fields[0] + fields[1] / 60 + fields[2] / 3600
+    out[negative] *= -1
+
+    return out.reshape(_shape), valid.reshape(_shape)
+
+
+def hms2dd_array(hms) -> Tuple[np_arr, np_arr]:
+    """
+    Convert an array of hour-minute-second strings to degree decimal in bulk.
+
+    Parameters
+    ----------
+    hms :
+        Array-like of strings in 'HH:MM:SS.s' format.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr]
+        Degree decimal float64 array and the boolean mask of well-formed rows, both with
+        the shape of the input. Malformed rows are NaN.
+
+    Notes
+    -------
+        As in hms2dd, negative hour values are taken as positive.
+
+    """
+    _shape = np.shape(hms)
+    fields, negative, valid = _sexagesimal_fields(hms)
+
+    n_negative = np.count_nonzero(negative & valid)
+    if n_negative:
+        diagnostics.report('negative_hms',
+                           f'{n_negative} RA values cannot be negative, assuming positive.',
+                           n_negative)
+
+    out = fields[0] * 15 + fields[1] / 4. + fields[2] / 240.
+
+    return out.reshape(_shape), valid.reshape(_shape)
+
+
 def dd2dms(degree_decimal: float) -> str:
     """
     Convert given degree decimal format to degree minute seconds.
@@ -171,13 +419,21 @@ def hms2dd(hms: str) -> float:
 
     """
 
-    hour, minute, sec = [float(i) for i in hms.split(':')]
+    degrees, negative = _parse_hms(hms)
+
+    # reported on every call, cached or not
+    if negative:
+        diagnostics.report('negative_hms',
+                           'RA value cannot be negative, assuming positive.')
 
-    if hour < 0:
-        print('RA value cannot be negative, assuming positive.')
-        hour = -hour
+    return degrees
+
+
+@lru_cache('hms2dd')
+def _parse_hms(hms: str) -> Tuple[float, bool]:
+    hour, minute, sec = [float(i) for i in hms.split(':')]
 
-    return hour * 15 + (minute / 4.) + (sec / 240.)
+    return abs(hour) * 15 + (minute / 4.) + (sec / 240.), hour < 0
 
 
 def dd2hms(degree_decimal: float) -> str:
@@ -197,7 +453,8 @@ def dd2hms(degree_decimal: float) -> str:
     """
 
     if degree_decimal < 0:
-        print('dd for HMS conversion cannot be negative, assuming positive.')
+        diagnostics.report('negative_dd_for_hms',
+                           'dd for HMS conversion cannot be negative, assuming positive.')
         _dd = -degree_decimal / 15
     else:
         _dd = degree_decimal / 15
@@ -226,6 +483,251 @@ def dd2hms(degree_decimal: float) -> str:
     return f'{int(_d)}:{int(_m)}:{_s}'
 
 
+def _sexagesimal_strings(units: np_arr, finite: np_arr, negative: np_arr,
+                         precision: int, lead_digits: int, signed: bool) -> np_arr:
+    """
+    Write arrays of rounded sexagesimal units to a fixed-width string array.
+
+    Parameters
+    ----------
+    units : np_arr
+        Absolute values as integer counts of 10**-precision seconds.
+    finite : np_arr
+        Mask of finite input values, the others are written as 'nan'.
+    negative : np_arr
+        Mask of negative input values.
+    precision : int
+        Number of decimals on the seconds.
+    lead_digits : int
+        Minimum number of digits for the leading (degree/hour) field.
+    signed : bool
+        Whether to write a leading '+'/'-' character.
+
+    Returns
+    -------
+    np_arr
+        Fixed-width string array, one row per input value.
+
+    """
+    _scale = 10**precision
+
+    # widen the leading field if any value needs it, so all rows keep one width
+    if units.size:
+        lead_digits = max(lead_digits, len(str(units.max() // (3600 * _scale))))
+
+    width = signed + lead_digits + 6 + (precision + 1 if precision > 0 else 0)
+
+    # for a few values, e.g. the outputs of a scalar call, the column passes below cost
+    # more than formatting each value in Python
+    if units.size <= 16:
+        _strings = []
+
+        for value, is_finite, is_negative in zip(units.tolist(), finite.tolist(),
+                                                 negative.tolist()):
+            if not is_finite:
+                _strings.append('nan'.rjust(width))
+                continue
+
+            _seconds, _fraction = divmod(value, _scale)
+            _minutes, _seconds = divmod(_seconds, 60)
+            _lead, _minutes = divmod(_minutes, 60)
+
+            _sign = ('-' if is_negative else '+') if signed else ''
+            _decimals = f'.{_fraction:0{precision}d}' if precision > 0 else ''
+
+            _strings.append(f'{_sign}{_lead:0{lead_digits}d}:{_minutes:02d}:'
+                            f'{_seconds:02d}{_decimals}')
+
+        return np.array(_strings, dtype=f'U{width}')
+
+    # the code points are written straight into the output, viewed as an (N, width)
+    # matrix, from the last column to the first so that every field is peeled off the
+    # remaining units with two reused buffers instead of one array per column
+    out = np.empty(units.size, dtype=f'U{width}')
+    codes = out.view(np.uint32).reshape(units.size, width)
+
+    remaining = units.astype(np.int64)
+    field, digit = np.empty_like(remaining), np.empty_like(remaining)
+    column = width
+
+    # (base splitting the field off the remaining units, digits, separator before it)
+    _fields = [(60, 2, 58), (60, 2, 58), (0, lead_digits, 0)]
+
+    if precision > 0:
+        _fields.insert(0, (_scale, precision, 46))
+
+    for base, n_digits, separator in _fields:
+        if base:
+            np.remainder(remaining, base, out=field)
+            np.floor_divide(remaining, base, out=remaining)
+        else:
+            field = remaining
+
+        for _ in range(n_digits):
+            column -= 1
+            np.remainder(field, 10, out=digit)
+            digit += 48
+            codes[:, column] = digit
+            field //= 10
+
+        if separator:
+            column -= 1
+            codes[:, column] = separator
+
+    if signed:
+        codes[:, 0] = 43
+        codes[negative, 0] = 45
+
+    codes[~finite] = 32
+    codes[~finite, -3:] = [110, 97, 110]
+
+    return out
+
+
+def dd2dms_array(degree_decimal, precision: int = 4, degree_digits: int = 2) -> np_arr:
+    """
+    Convert an array of degree decimal values to fixed-width DMS strings in bulk.
+
+    Parameters
+    ----------
+    degree_decimal :
+        Array-like of degree decimal values.
+    precision : int, optional
+        Number of decimals on the seconds. The default is 4.
+    degree_digits : int, optional
+        Minimum number of zero-padded digits of the degree field. It is widened
+        automatically if a value needs more. The default is 2.
+
+    Returns
+    -------
+    np_arr
+        Array of '+DD:MM:SS.ssss' strings with the shape of the input.
+
+    Notes
+    -------
+        Rounding is done on the total number of seconds, so 59.99995" carries into the
+        minutes and degrees. Non-finite values are written as 'nan'.
+
+    """
+    _dd = np.asarray(degree_decimal, dtype=float)
+    _flat = _dd.ravel()
+    finite = np.isfinite(_flat)
+
+    _abs = np.abs(np.where(finite, _flat, 0))
+    units = np.round(_abs * 3600 * 10**precision).astype(np.int64)
+
+    out = _sexagesimal_strings(units, finite, (_flat < 0) & (units > 0), precision,
+                               degree_digits, signed=True)
+
+    return out.reshape(_dd.shape)
+
+
+def dd2hms_array(degree_decimal, precision: int = 4, hour_digits: int = 2) -> np_arr:
+    """
+    Convert an array of degree decimal values to fixed-width HMS strings in bulk.
+
+    Parameters
+    ----------
+    degree_decimal :
+        Array-like of degree decimal values.
+    precision : int, optional
+        Number of decimals on the seconds. The default is 4.
+    hour_digits : int, optional
+        Minimum number of zero-padded digits of the hour field. The default is 2.
+
+    Returns
+    -------
+    np_arr
+        Array of 'HH:MM:SS.ssss' strings with the shape of the input.
+
+    Notes
+    -------
+        As in dd2hms, negative values are taken as positive. Rounding is done on the
+        total number of seconds, so the 60 seconds carry is handled. Non-finite values
+        are written as 'nan'.
+
+    """
+    _dd = np.asarray(degree_decimal, dtype=float)
+    _flat = _dd.ravel()
+    finite = np.isfinite(_flat)
+
+    n_negative = np.count_nonzero(_flat < 0)
+    if n_negative:
+        diagnostics.report('negative_dd_for_hms',
+                           f'{n_negative} dd values for HMS conversion cannot be '
+                           f'negative, assuming positive.', n_negative)
+
+    _abs = np.abs(np.where(finite, _flat, 0))
+    units = np.round(_abs * 240 * 10**precision).astype(np.int64)
+
+    out = _sexagesimal_strings(units, finite, np.zeros(_flat.shape, dtype=bool),
+                               precision, hour_digits, signed=False)
+
+    return out.reshape(_dd.shape)
+
+
+def ra2ha(right_ascension: FloatStrArr, local_time: FloatStrArr,
+          deg_rad: bool = True) -> Union[float, np_arr]:
+    """
+    Convert right ascension to hour angle numerically, for scalars or arrays.
+
+    Parameters
+    ----------
+    right_ascension : FloatStrArr
+        Right ascension value(s) for the celestial object(s).
+    local_time : FloatStrArr
+        Local time(s) for the observer.
+    deg_rad : bool, optional
+        Whether the given values are in degrees or radians. The default is True.
+
+    Returns
+    -------
+    Union[float, np_arr]
+        Hour angle value(s), wrapped to [0, 360) degrees or [0, 2pi) radians.
+
+    Notes
+    -------
+        String inputs are parsed as HMS, and converted to radians if deg_rad is False.
+        Unlike RA2HA, the result stays a float, so there is no string round-trip nor
+        rounding to 4 decimals of a second.
+
+    """
+    _ra = _change_instance_angle(right_ascension, 'hms', deg_rad)
+    _lt = _change_instance_angle(local_time, 'hms', deg_rad)
+
+    return np.mod(_lt - _ra, 360 if deg_rad else 2 * np.pi)
+
+
+def ha2ra(hour_angle: FloatStrArr, local_time: FloatStrArr,
+          deg_rad: bool = True) -> Union[float, np_arr]:
+    """
+    Convert hour angle to right ascension numerically, for scalars or arrays.
+
+    Parameters
+    ----------
+    hour_angle : FloatStrArr
+        Hour angle value(s) for the celestial object(s).
+    local_time : FloatStrArr
+        Local time(s) for the observer.
+    deg_rad : bool, optional
+        Whether the given values are in degrees or radians. The default is True.
+
+    Returns
+    -------
+    Union[float, np_arr]
+        Right ascension value(s), wrapped to [0, 360) degrees or [0, 2pi) radians.
+
+    Notes
+    -------
+        String inputs are parsed as HMS, and converted to radians if deg_rad is False.
+
+    """
+    _ha = _change_instance_angle(hour_angle, 'hms', deg_rad)
+    _lt = _change_instance_angle(local_time, 'hms', deg_rad)
+
+    return np.mod(_lt - _ha, 360 if deg_rad else 2 * np.pi)
+
+
 def RA2HA(right_ascension: FloatStr, local_time: FloatStr) -> str:
     """
     Converts right ascension to its corresponding hour angle value depending upon the
@@ -246,13 +748,7 @@ def RA2HA(right_ascension: FloatStr, local_time: FloatStr) -> str:
 
     """
 
-    _ra = change_instance(right_ascension, 'hms')
-    _lt = change_instance(local_time, 'hms')
-
-    if _ra > _lt:
-        _lt += 360
-
-    return dd2hms(_lt - _ra)
+    return dd2hms(ra2ha(right_ascension, local_time))
 
 
 def HA2RA(hour_angle: FloatStrArr, local_time: FloatStr) -> str:
@@ -279,10 +775,4 @@ def HA2RA(hour_angle: FloatStrArr, local_time: FloatStr) -> str:
         their values.
     """
 
-    _ha = change_instance(hour_angle, 'hms')
-    _lt = change_instance(local_time, 'hms')
-
-    if _ha > _lt:
-        _lt += 360
-
-    return dd2hms(_lt - _ha)
+    return dd2hms(ha2ra(hour_angle, local_time))
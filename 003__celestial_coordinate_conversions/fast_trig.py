@@ -0,0 +1,66 @@
+"""
+Created on Oct 18 16:32:55 2026
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+import conversion_utilities as utils
+
+np_arr = utils.np_arr
+
+_TWO_PI = 2 * np.pi
+
+# bound of |sin_cos(x) - (sin(x), cos(x))|, in radians: pi * 2**-24 from rounding the
+# reduced argument to float32, plus 1.5 float32 ulp from the kernels themselves
+MAX_ERROR = 4e-7
+
+# the resulting bound on the azimuth and altitude of equatorial2horizontal_array with
+# approximate=True, in arcseconds, as checked by benchmarks.benchmark_approximate
+MAX_ERROR_ARCSEC = 0.5
+
+
+def sin_cos(angle, dtype: type = np.float64) -> Tuple[np_arr, np_arr]:
+    """
+    Approximate the sine and cosine of angles in radians.
+
+    Parameters
+    ----------
+    angle :
+        Angle(s) in radians, of any magnitude.
+    dtype : type, optional
+        Floating point type of the results. The default is np.float64.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr]
+        sin and cos of the angles, within MAX_ERROR (about 0.1 arcsecond) of the
+        exact values.
+
+    Notes
+    -------
+        The angle is reduced to [-pi, pi] in its own precision and then evaluated by
+        the float32 sin/cos of numpy, whose vectorized kernels are much cheaper than
+        the float64 ones on most x86 builds. With the reduction and the casts, this
+        makes equatorial2horizontal_array about twice as fast for float64, as
+        measured by benchmarks.benchmark_approximate. For float32 angles it is
+        slower than np.sin/np.cos, as it only adds the reduction.
+
+    """
+    angle = np.asarray(angle)
+
+    # float32 input has already been rounded, so only float64 is reduced in float64
+    if angle.dtype != np.float32:
+        angle = angle.astype(np.float64, copy=False)
+
+    reduced = angle - angle.dtype.type(_TWO_PI) * np.rint(angle / _TWO_PI)
+    reduced = reduced.astype(np.float32, copy=False)
+
+    return (np.sin(reduced).astype(dtype, copy=False),
+            np.cos(reduced).astype(dtype, copy=False))
+
+
+def hypot(x: np_arr, y: np_arr) -> np_arr:
+    """sqrt(x**2 + y**2) without the overflow guards of np.hypot, for unit scales."""
+    return np.sqrt(x * x + y * y)
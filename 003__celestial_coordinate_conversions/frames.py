@@ -0,0 +1,506 @@
+"""
+Created on Oct 18 11:02:15 2026
+"""
+
+import math
+from typing import Tuple, Union
+
+import numpy as np
+
+import conversion_utilities as utils
+from caching import lru_cache
+from conversion_errors import UnknownFrame
+
+np_arr = utils.np_arr
+
+FRAMES = ('equatorial', 'ecliptic', 'galactic')
+
+OBLIQUITY = 23.43927944
+RA_NGP = 192.85948
+DEC_NGP = 27.12825
+LONG_NCP = 122.93192
+
+# epoch of the constants above, as a Julian year
+J2000 = 2000.
+
+Epoch = Union[float, str]
+
+
+def spherical2unit(longitude, latitude) -> np_arr:
+    """
+    Convert longitude/latitude pairs (in radians) to unit vectors.
+
+    Parameters
+    ----------
+    longitude :
+        Longitude(s) in radians.
+    latitude :
+        Latitude(s) in radians.
+
+    Returns
+    -------
+    np_arr
+        Unit vectors with shape (..., 3).
+
+    """
+    longitude, latitude = np.broadcast_arrays(longitude, latitude)
+    cos_lat = np.cos(latitude)
+
+    return np.stack([cos_lat * np.cos(longitude), cos_lat * np.sin(longitude),
+                     np.sin(latitude)], axis=-1)
+
+
+def unit2spherical(vectors: np_arr) -> Tuple[np_arr, np_arr]:
+    """
+    Convert unit vectors to longitude/latitude pairs in radians.
+
+    Parameters
+    ----------
+    vectors : np_arr
+        Unit vectors with shape (..., 3).
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr]
+        Longitude in [0, 2pi) and latitude in [-pi/2, pi/2].
+
+    """
+    x, y, z = np.moveaxis(vectors, -1, 0)
+
+    longitude = np.mod(np.arctan2(y, x), 2 * np.pi)
+    # arctan2 rather than arcsin, which loses precision near the poles
+    latitude = np.arctan2(z, np.hypot(x, y))
+
+    return longitude, latitude
+
+
+def _sin_cos(angle: np_arr, scale: float) -> Tuple[np_arr, np_arr]:
+    """
+    sin and cos of scale * angle from t, the tangent of the half angle, as 2t / (1 + t^2)
+    and (1 - t^2) / (1 + t^2). This is one tan pass instead of a sin and a cos pass,
+    with absolute errors of a few 1e-16, which is all unit vector components need.
+    """
+    sin = angle * (scale / 2)
+    np.tan(sin, out=sin)
+
+    _t2 = sin * sin
+    cos = 1 - _t2
+    _t2 += 1
+
+    cos /= _t2
+    sin *= 2
+    sin /= _t2
+
+    return sin, cos
+
+
+def _check_frame(frame: str) -> str:
+    frame = frame.lower()
+
+    if frame not in FRAMES:
+        raise UnknownFrame(f'The frame must be one of {", ".join(FRAMES)}.')
+
+    return frame
+
+
+def julian_year(epoch: Epoch) -> float:
+    """
+    Convert an epoch to a Julian year.
+
+    Parameters
+    ----------
+    epoch : Epoch
+        Julian year as a float or a string such as 'J2000' or '2000.0', or Besselian
+        year as a string such as 'B1950'.
+
+    Returns
+    -------
+    float
+        The Julian year of the epoch.
+
+    """
+    if not isinstance(epoch, str):
+        return float(epoch)
+
+    epoch = epoch.strip().upper()
+
+    if epoch.startswith('B'):
+        _jd = 2415020.31352 + (float(epoch[1:]) - 1900) * 365.242198781
+
+        return J2000 + (_jd - 2451545.) / 365.25
+
+    return float(epoch.lstrip('J'))
+
+
+def mean_obliquity(epoch: Epoch) -> float:
+    """Mean obliquity of the ecliptic at an epoch, in degrees (IAU 1976)."""
+    t = (julian_year(epoch) - J2000) / 100
+
+    return (84381.448 + t * (-46.8150 + t * (-0.00059 + t * 0.001813))) / 3600
+
+
+@lru_cache('precession_matrix', maxsize=128)
+def precession_matrix(from_epoch: float, to_epoch: float) -> np_arr:
+    """
+    Rotation matrix precessing equatorial unit vectors between two mean equinoxes.
+
+    Parameters
+    ----------
+    from_epoch : float
+        Julian year of the input equinox.
+    to_epoch : float
+        Julian year of the output equinox.
+
+    Returns
+    -------
+    np_arr
+        Read-only 3x3 matrix P such that v_to = P @ v_from.
+
+    Notes
+    -------
+        Uses the IAU 1976 angles zeta, z and theta, which are accurate to well below
+        an arcsecond within a few centuries of J2000. Matrices are cached per pair of
+        epochs, with a bound of 128 pairs.
+
+    """
+    big_t = (from_epoch - J2000) / 100
+    t = (to_epoch - from_epoch) / 100
+
+    _rate = 2306.2181 + 1.39656 * big_t - 0.000139 * big_t**2
+
+    zeta = _rate * t + (0.30188 - 0.000344 * big_t) * t**2 + 0.017998 * t**3
+    z = _rate * t + (1.09468 + 0.000066 * big_t) * t**2 + 0.018203 * t**3
+    theta = (2004.3109 - 0.85330 * big_t - 0.000217 * big_t**2) * t
+    theta -= (0.42665 + 0.000217 * big_t) * t**2 + 0.041833 * t**3
+
+    zeta, z, theta = np.radians(np.array([zeta, z, theta]) / 3600)
+
+    def _rz(angle):
+        return np.array([[np.cos(angle), -np.sin(angle), 0],
+                         [np.sin(angle), np.cos(angle), 0],
+                         [0, 0, 1]])
+
+    _ry = np.array([[np.cos(theta), 0, -np.sin(theta)],
+                    [0, 1, 0],
+                    [np.sin(theta), 0, np.cos(theta)]])
+
+    matrix = _rz(z) @ _ry @ _rz(zeta)
+    matrix.setflags(write=False)
+
+    return matrix
+
+
+def _equatorial2frame(frame: str, obliquity: float,
+                      galactic_pole: Tuple[float, float]) -> np_arr:
+    """
+    Rotation matrix taking equatorial unit vectors to the given frame. Not cached
+    itself, the result is only used to build the cached rotation_matrix.
+    """
+    if frame == 'equatorial':
+        return np.eye(3)
+
+    if frame == 'ecliptic':
+        _eps = np.radians(obliquity)
+
+        return np.array([[1, 0, 0],
+                         [0, np.cos(_eps), np.sin(_eps)],
+                         [0, -np.sin(_eps), np.cos(_eps)]])
+
+    # the galactic frame is fixed by the north galactic pole, which becomes the z-axis,
+    # and the galactic longitude of the north celestial pole
+    _ngp = spherical2unit(*np.radians(galactic_pole))
+    _ncp = spherical2unit(*np.radians([LONG_NCP, galactic_pole[1]]))
+    _z = np.array([0., 0., 1.])
+
+    _equatorial = np.column_stack([_ngp, _z, np.cross(_ngp, _z)])
+    _galactic = np.column_stack([_z, _ncp, np.cross(_z, _ncp)])
+
+    return _galactic @ np.linalg.inv(_equatorial)
+
+
+def _j2000_to_frame(frame: str, obliquity: float, epoch: float,
+                    galactic_pole: Tuple[float, float]) -> np_arr:
+    """Rotation matrix taking J2000 equatorial unit vectors to a frame of an epoch."""
+    if epoch is None or frame == 'galactic':
+        return _equatorial2frame(frame, obliquity, galactic_pole)
+
+    _precession = precession_matrix(J2000, epoch)
+
+    if frame == 'equatorial':
+        return _precession
+
+    return _equatorial2frame(frame, mean_obliquity(epoch), galactic_pole) @ _precession
+
+
+@lru_cache('rotation_matrix', maxsize=256)
+def rotation_matrix(from_frame: str, to_frame: str,
+                    obliquity: float = OBLIQUITY,
+                    from_epoch: Epoch = None,
+                    to_epoch: Epoch = None,
+                    galactic_pole: Tuple[float, float] = (RA_NGP, DEC_NGP)) -> np_arr:
+    """
+    Get the composed rotation matrix between two frames.
+
+    Parameters
+    ----------
+    from_frame : str
+        Frame of the input coordinates, one of FRAMES.
+    to_frame : str
+        Frame of the output coordinates, one of FRAMES.
+    obliquity : float, optional
+        The value for the obliquity of the ecliptic. The default is 23.43927944.
+    from_epoch : Epoch, optional
+        Equinox of equatorial or ecliptic input coordinates. The default is None, for
+        the J2000 constants of this module.
+    to_epoch : Epoch, optional
+        Equinox of equatorial or ecliptic output coordinates. The default is None.
+    galactic_pole : Tuple[float, float], optional
+        RA and Dec of the north galactic pole in degrees, the galactic longitude of the
+        north celestial pole staying LONG_NCP. The default is (RA_NGP, DEC_NGP).
+
+    Raises
+    ------
+    UnknownFrame
+        Raised if either frame is not in FRAMES.
+
+    Returns
+    -------
+    np_arr
+        Read-only 3x3 matrix R such that v_to = R @ v_from.
+
+    Notes
+    -------
+        Matrices are cached, with a bound of 256 and under the caching registry like
+        precession_matrix, so a chained transform such as ecliptic to galactic is
+        composed only once per process. The ecliptic of a given epoch uses the mean
+        obliquity of that epoch instead of the obliquity argument. The galactic frame
+        does not depend on the epoch.
+
+    """
+    from_frame, to_frame = _check_frame(from_frame), _check_frame(to_frame)
+    from_epoch, to_epoch = [None if i is None else julian_year(i) for i in
+                            [from_epoch, to_epoch]]
+
+    _to = _j2000_to_frame(to_frame, obliquity, to_epoch, galactic_pole)
+    _from = _j2000_to_frame(from_frame, obliquity, from_epoch, galactic_pole)
+
+    matrix = _to @ _from.T
+    matrix.setflags(write=False)
+
+    return matrix
+
+
+def transform(longitude,
+              latitude,
+              from_frame: str,
+              to_frame: str,
+              deg_rad: str = 'deg',
+              obliquity: float = OBLIQUITY,
+              dtype: type = np.float64,
+              from_epoch: Epoch = None,
+              to_epoch: Epoch = None) -> Tuple[np_arr, np_arr]:
+    """
+    Convert arrays of coordinates between the equatorial, ecliptic and galactic frames.
+
+    Parameters
+    ----------
+    longitude :
+        Longitude-like coordinate (RA, ecliptic or galactic longitude).
+    latitude :
+        Latitude-like coordinate (Dec, ecliptic or galactic latitude).
+    from_frame : str
+        Frame of the input coordinates, one of FRAMES.
+    to_frame : str
+        Frame of the output coordinates, one of FRAMES.
+    deg_rad : str, optional
+        Whether the input and output angles are in degrees or radians. The default is
+        'deg'.
+    obliquity : float, optional
+        The value for the obliquity of the ecliptic. The default is 23.43927944.
+    dtype : type, optional
+        Floating point precision of the whole computation, np.float64 or np.float32.
+        float32 halves the memory traffic and keeps errors well below an arcsecond.
+        The default is np.float64.
+    from_epoch : Epoch, optional
+        Equinox of equatorial or ecliptic input coordinates, e.g. 1950.0, 'J2015.5' or
+        'B1950'. The default is None, for the J2000 constants of this module.
+    to_epoch : Epoch, optional
+        Equinox of equatorial or ecliptic output coordinates. The default is None.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr]
+        Longitude in [0, 360) and latitude in [-90, 90] of the target frame.
+
+    Notes
+    -------
+        The conversion costs one rotation of the unit vectors plus one arctan2 pass,
+        whatever the pair of frames and epochs. See rotate.
+
+    """
+    return rotate(longitude, latitude,
+                  rotation_matrix(from_frame, to_frame, obliquity, from_epoch,
+                                  to_epoch), deg_rad, dtype)
+
+
+def _rotate_pair(longitude: float, latitude: float, matrix: list,
+                 deg_rad: str) -> Tuple[float, float]:
+    """
+    rotate for a single finite pair, with the math module, whose calls cost far less
+    than the array passes for one value.
+    """
+    if deg_rad == 'deg':
+        longitude, latitude = math.radians(longitude), math.radians(latitude)
+
+    cos_lat = math.cos(latitude)
+    vector = [cos_lat * math.cos(longitude), cos_lat * math.sin(longitude),
+              math.sin(latitude)]
+
+    x, y, z = [sum(m * v for m, v in zip(row, vector)) for row in matrix]
+
+    longitude, latitude = math.atan2(y, x), math.atan2(z, math.hypot(x, y))
+
+    if deg_rad == 'deg':
+        longitude, latitude = math.degrees(longitude), math.degrees(latitude)
+
+    _period = 360. if deg_rad == 'deg' else 2 * math.pi
+    longitude %= _period
+
+    # as in rotate, tiny negative longitudes round to the period itself
+    return (0. if longitude == _period else longitude), latitude
+
+
+def rotate(longitude,
+           latitude,
+           matrix: np_arr,
+           deg_rad: str = 'deg',
+           dtype: type = np.float64) -> Tuple[np_arr, np_arr]:
+    """
+    Rotate arrays of longitude/latitude pairs by a 3x3 matrix, e.g. one given by
+    rotation_matrix.
+
+    Parameters
+    ----------
+    longitude :
+        Longitude-like coordinate of the input frame.
+    latitude :
+        Latitude-like coordinate of the input frame.
+    matrix : np_arr
+        3x3 matrix R taking the input unit vectors v to R @ v.
+    deg_rad : str, optional
+        Whether the input and output angles are in degrees or radians. The default is
+        'deg'.
+    dtype : type, optional
+        Floating point precision of the computation. The default is np.float64.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr]
+        Longitude in [0, 360) and latitude in [-90, 90] of the rotated frame.
+
+    Notes
+    -------
+        The unit vectors are kept as three component arrays and rotated one matrix row
+        at a time, skipping the zero entries, instead of stacking an (N, 3) array for
+        a matrix multiply. The sines and cosines come from half-angle tangents, see
+        _sin_cos.
+
+    """
+    matrix = np.asarray(matrix).astype(dtype)
+
+    longitude, latitude = np.broadcast_arrays(np.asarray(longitude, dtype=dtype),
+                                              np.asarray(latitude, dtype=dtype))
+
+    shape = longitude.shape
+
+    if shape == () and math.isfinite(longitude) and math.isfinite(latitude):
+        longitude, latitude = _rotate_pair(float(longitude), float(latitude),
+                                           matrix.tolist(), deg_rad)
+
+        return dtype(longitude), dtype(latitude)
+
+    # the in-place operations below need arrays, which 0-d operations do not return
+    longitude, latitude = np.atleast_1d(longitude, latitude)
+
+    _scale = np.pi / 180 if deg_rad == 'deg' else 1.
+
+    y, x = _sin_cos(longitude, _scale)
+    z, cos_lat = _sin_cos(latitude, _scale)
+
+    x *= cos_lat
+    y *= cos_lat
+
+    vector, rotated = [x, y, z], []
+
+    for row in matrix:
+        _terms = [(m, v) for m, v in zip(row, vector) if m != 0]
+        component = _terms[0][1] * _terms[0][0]
+
+        for m, v in _terms[1:]:
+            np.multiply(v, m, out=cos_lat)
+            component += cos_lat
+
+        rotated.append(component)
+
+    x, y, z = rotated
+
+    longitude = np.arctan2(y, x)
+
+    # sqrt rather than hypot, as the components of unit vectors cannot overflow, and
+    # arctan2 rather than arcsin, which loses precision near the poles
+    x *= x
+    y *= y
+    x += y
+    latitude = np.arctan2(z, np.sqrt(x, out=x))
+
+    if deg_rad == 'deg':
+        np.degrees(longitude, out=longitude)
+        np.degrees(latitude, out=latitude)
+
+    # wrap to [0, period), tiny negative longitudes rounding to the period itself
+    _period = 360. if deg_rad == 'deg' else 2 * np.pi
+    np.add(longitude, _period, out=longitude, where=longitude < 0)
+    np.subtract(longitude, _period, out=longitude, where=longitude >= _period)
+
+    if shape == ():
+        return longitude[0], latitude[0]
+
+    return longitude, latitude
+
+
+def precess(longitude,
+            latitude,
+            from_epoch: Epoch,
+            to_epoch: Epoch,
+            frame: str = 'equatorial',
+            deg_rad: str = 'deg',
+            dtype: type = np.float64) -> Tuple[np_arr, np_arr]:
+    """
+    Precess arrays of equatorial or ecliptic coordinates between two equinoxes.
+
+    Parameters
+    ----------
+    longitude :
+        RA or ecliptic longitude.
+    latitude :
+        Dec or ecliptic latitude.
+    from_epoch : Epoch
+        Equinox of the input coordinates.
+    to_epoch : Epoch
+        Equinox of the output coordinates.
+    frame : str, optional
+        'equatorial' or 'ecliptic'. The default is 'equatorial'.
+    deg_rad : str, optional
+        Whether the input and output angles are in degrees or radians. The default is
+        'deg'.
+    dtype : type, optional
+        Floating point precision of the computation. The default is np.float64.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr]
+        Longitude in [0, 360) and latitude in [-90, 90] at the output equinox.
+
+    """
+    return transform(longitude, latitude, frame, frame, deg_rad, dtype=dtype,
+                     from_epoch=from_epoch, to_epoch=to_epoch)
@@ -0,0 +1,155 @@
+"""
+Created on Oct 18 11:47:20 2026
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+import conversion_utilities as utils
+from conversion_errors import OutputTypeError
+
+np_arr = utils.np_arr
+FloatStrArr = utils.FloatStrArr
+
+# number of recurrence steps after which the hour angle terms are recomputed exactly,
+# which keeps the accumulated rounding error at the 1e-14 level
+_RESYNC_STEPS = 256
+
+# the recurrence loops over the time steps in Python, at a fixed cost per step, so it
+# only beats the trig of the direct method with enough targets per step
+_RECURRENCE_MIN_TARGETS = 512
+
+
+class HorizonTracker:
+    """
+    HorizonTracker follows a list of targets across a grid of local times. The
+    time-invariant terms of the equatorial to horizontal conversion are computed once
+    per target, so a whole night costs a few array operations per time step.
+
+    The conventions are those of celestial_coordinates.equatorial2horizontal.
+    """
+
+    def __init__(self, right_ascension: FloatStrArr, declination: FloatStrArr,
+                 observer_latitude: FloatStrArr):
+        _ra = utils.change_instance_array(right_ascension, 'hms').ravel()
+        _dec = utils.change_instance_array(declination).ravel()
+        _lat = float(utils.change_instance_array(observer_latitude))
+
+        self.right_ascension = np.radians(_ra)
+        self.southern = _lat < 0
+
+        _lat, _dec = np.radians(_lat), np.radians(_dec)
+
+        self._sin_lat_sin_dec = np.sin(_lat) * np.sin(_dec)
+        self._cos_lat_cos_dec = np.cos(_lat) * np.cos(_dec)
+        self._cos_lat_sin_dec = np.cos(_lat) * np.sin(_dec)
+        self._sin_lat_cos_dec = np.sin(_lat) * np.cos(_dec)
+        self._cos_dec = np.cos(_dec)
+
+    def __len__(self):
+        return self.right_ascension.size
+
+    def _horizontal(self, cos_ha: np_arr, sin_ha: np_arr) -> Tuple[np_arr, np_arr]:
+        """Azimuth and altitude in degrees from the (times x targets) hour angle terms."""
+        x = self._cos_lat_sin_dec - self._sin_lat_cos_dec * cos_ha
+        y = self._cos_dec * sin_ha
+
+        azimuth = np.degrees(-np.arctan2(y, x))
+
+        altitude = self._sin_lat_sin_dec + self._cos_lat_cos_dec * cos_ha
+        altitude = np.degrees(np.arcsin(np.clip(altitude, -1, 1)))
+
+        return azimuth, altitude
+
+    def _hour_angle_terms(self, local_times: np_arr,
+                          recurrence: bool) -> Tuple[np_arr, np_arr]:
+        """cos/sin of the (times x targets) hour angles."""
+        if not recurrence:
+            hour_angle = local_times[:, None] - self.right_ascension[None, :]
+
+            return np.cos(hour_angle), np.sin(hour_angle)
+
+        # cos(H + dH) and sin(H + dH) from the previous step, by the angle addition
+        # formulas, with an exact evaluation every _RESYNC_STEPS rows
+        _step = local_times[1] - local_times[0]
+        _cos_step, _sin_step = np.cos(_step), np.sin(_step)
+
+        cos_ha = np.empty((local_times.size, len(self)))
+        sin_ha = np.empty((local_times.size, len(self)))
+
+        for j in range(local_times.size):
+            if j % _RESYNC_STEPS == 0:
+                _hour_angle = local_times[j] - self.right_ascension
+                np.cos(_hour_angle, out=cos_ha[j])
+                np.sin(_hour_angle, out=sin_ha[j])
+            else:
+                _c, _s = cos_ha[j - 1], sin_ha[j - 1]
+                cos_ha[j] = _c * _cos_step - _s * _sin_step
+                sin_ha[j] = _s * _cos_step + _c * _sin_step
+
+        return cos_ha, sin_ha
+
+    def track(self, local_times: FloatStrArr, output_parameter: str = 'altitude',
+              method: str = 'auto') -> Tuple[np_arr, np_arr]:
+        """
+        Compute the azimuth and altitude/zenith angle of every target at every time.
+
+        Parameters
+        ----------
+        local_times : FloatStrArr
+            Local times of the observer, as degrees or HMS strings.
+        output_parameter : str, optional
+            Whether to give altitude or zenith angle as output. The default is
+            'altitude'.
+        method : str, optional
+            'direct' evaluates the hour angle trig for every element, 'recurrence'
+            steps it with the angle addition formulas and needs a uniform time grid,
+            'auto' picks the recurrence for uniform grids of at least 512 targets, below
+            which its per-step loop is slower. The default is 'auto'.
+
+        Raises
+        ------
+        OutputTypeError
+            Raised if the output parameter or the method is not recognised, or if the
+            recurrence is requested on a non-uniform grid.
+
+        Returns
+        -------
+        Tuple[np_arr, np_arr]
+            Azimuth and altitude/zenith angle matrices of shape (targets, times).
+
+        """
+        output_parameter = output_parameter.lower()
+
+        if output_parameter not in ['altitude', 'zenith', 'zenith angle']:
+            raise OutputTypeError('The output type must either be \'altitude\', '
+                                  '\'zenith\', or \'zenith angle\'.')
+
+        if method not in ['auto', 'direct', 'recurrence']:
+            raise OutputTypeError('The method must either be \'auto\', \'direct\' or '
+                                  '\'recurrence\'.')
+
+        local_times = np.radians(utils.change_instance_array(local_times, 'hms').ravel())
+
+        _steps = np.diff(local_times)
+        uniform = _steps.size > 0 and np.allclose(_steps, _steps[0], rtol=0, atol=1e-12)
+
+        if method == 'recurrence' and not uniform:
+            raise OutputTypeError('The recurrence method needs a uniform time grid.')
+
+        if method == 'auto':
+            recurrence = uniform and len(self) >= _RECURRENCE_MIN_TARGETS
+        else:
+            recurrence = method == 'recurrence'
+
+        azimuth, alt = self._horizontal(*self._hour_angle_terms(local_times, recurrence))
+
+        if output_parameter != 'altitude':
+            alt = utils.altitude2zenith(alt)
+
+        if self.southern:
+            azimuth = 180 - azimuth
+
+        # the work is laid out with one contiguous row per time step
+        return azimuth.T, alt.T
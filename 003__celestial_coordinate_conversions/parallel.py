@@ -0,0 +1,313 @@
+"""
+Created on Oct 18 15:41:09 2026
+"""
+
+import ctypes
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.sharedctypes import RawArray
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+import celestial_coordinates as cc
+import conversion_utilities as utils
+import frames
+from conversion_errors import IncompleteArguments
+
+np_arr = utils.np_arr
+FloatStrArr = utils.FloatStrArr
+
+# a shared float64 buffer and the offset of the rows in it, in values
+SharedRows = Tuple[ctypes.Array, int]
+
+# views of the shared buffers in a worker process, set once by _init_worker
+_WORKER = {}
+
+
+def shared_empty(shape) -> np_arr:
+    """
+    Uninitialized float64 array in memory shared with worker processes. run_parallel
+    reads such inputs and writes such out arrays in place, without copies.
+
+    Parameters
+    ----------
+    shape :
+        Shape of the array.
+
+    Returns
+    -------
+    np_arr
+        The array. The shared memory is freed with the last view of it.
+
+    """
+    size = int(np.prod(shape))
+    _raw = RawArray(ctypes.c_double, max(size, 1))
+
+    return np.frombuffer(_raw, dtype=np.float64, count=size).reshape(shape)
+
+
+def _shared_rows(array: np_arr) -> SharedRows:
+    """
+    The shared buffer and offset of a C-contiguous float64 array made by
+    shared_empty, or None for any other array.
+    """
+    if array.dtype != np.float64 or not array.flags.c_contiguous:
+        return None
+
+    _base = array
+
+    while _base is not None and not isinstance(_base, ctypes.Array):
+        _base = _base.obj if isinstance(_base, memoryview) else getattr(_base, 'base',
+                                                                        None)
+
+    if _base is None:
+        return None
+
+    return _base, (array.ctypes.data - ctypes.addressof(_base)) // 8
+
+
+def _rows(shared: SharedRows, size: int) -> np_arr:
+    """The flat float64 view of size values of a shared buffer."""
+    _raw, offset = shared
+
+    return np.frombuffer(_raw, dtype=np.float64, count=size, offset=offset * 8)
+
+
+def _init_worker(func: Callable, inputs: Dict[str, SharedRows],
+                 outputs: List[SharedRows], size: int, kwargs: dict):
+    """Wrap the shared buffers once per worker process."""
+    _WORKER.update(func=func, kwargs=kwargs,
+                   inputs={k: _rows(v, size) for k, v in inputs.items()},
+                   outputs=[_rows(i, size) for i in outputs])
+
+
+def _run_chunk(start: int, stop: int):
+    """Convert rows start:stop of the shared inputs into the shared outputs."""
+    _inputs = {k: v[start:stop] for k, v in _WORKER['inputs'].items()}
+    results = _WORKER['func'](**_inputs, **_WORKER['kwargs'])
+
+    for _out, _result in zip(_WORKER['outputs'], results):
+        _out[start:stop] = _result
+
+
+def run_parallel(func: Callable,
+                 inputs: Dict[str, np_arr],
+                 kwargs: dict = None,
+                 n_outputs: int = 2,
+                 workers: int = None,
+                 chunk_size: int = 250_000,
+                 out: Tuple[np_arr, ...] = None) -> Tuple[np_arr, ...]:
+    """
+    Run an element-wise conversion over worker processes sharing the input buffers.
+
+    Parameters
+    ----------
+    func : Callable
+        Module-level conversion function. It is called with the input keywords on
+        slices of the inputs plus kwargs, and must return n_outputs arrays.
+    inputs : Dict[str, np_arr]
+        Keyword arguments holding the arrays to split, in degrees. They are broadcast
+        together and flattened.
+    kwargs : dict, optional
+        Keyword arguments passed unchanged to every call. The default is None.
+    n_outputs : int, optional
+        Number of arrays returned by func. The default is 2.
+    workers : int, optional
+        Number of worker processes. The default is None, for os.cpu_count(). With one
+        worker the conversion runs in the calling process.
+    chunk_size : int, optional
+        Number of rows per task. The default is 250_000.
+    out : Tuple[np_arr, ...], optional
+        Preallocated C-contiguous float64 arrays of the broadcast input shape to write
+        the results into. The workers write directly into arrays from shared_empty,
+        other arrays are filled with one copy at the end. The default is None.
+
+    Raises
+    ------
+    IncompleteArguments
+        Raised if out does not hold n_outputs C-contiguous float64 arrays of the input
+        shape.
+
+    Returns
+    -------
+    Tuple[np_arr, ...]
+        The output arrays, shaped as the broadcast inputs. Without out, they are the
+        shared buffers the workers wrote into.
+
+    Notes
+    -------
+        The inputs and outputs live in shared memory that the workers map once, so
+        only the row ranges are pickled per task. Inputs from shared_empty are used in
+        place, others are copied into shared memory first.
+
+    """
+    kwargs = {} if kwargs is None else kwargs
+    workers = os.cpu_count() if workers is None else max(int(workers), 1)
+
+    _names = list(inputs)
+    _arrays = np.broadcast_arrays(*[np.asarray(inputs[i], dtype=np.float64) for i in
+                                    _names])
+    shape, size = _arrays[0].shape, _arrays[0].size
+
+    if out is not None and (len(out) != n_outputs or not all(
+            isinstance(i, np.ndarray) and i.shape == shape and i.dtype == np.float64 and
+            i.flags.c_contiguous for i in out)):
+        raise IncompleteArguments(f'out must hold {n_outputs} C-contiguous float64 '
+                                  f'arrays of shape {shape}.')
+
+    _bounds = [(i, min(i + chunk_size, size)) for i in range(0, size, chunk_size)]
+
+    if workers == 1 or len(_bounds) < 2:
+        if out is None:
+            out = tuple(np.empty(shape) for _ in range(n_outputs))
+
+        _inputs = [i.ravel() for i in _arrays]
+
+        for start, stop in _bounds:
+            results = func(**{k: v[start:stop] for k, v in zip(_names, _inputs)},
+                           **kwargs)
+
+            for _out, _result in zip(out, results):
+                _out.reshape(-1)[start:stop] = _result
+
+        return out
+
+    _inputs = {}
+
+    for _name, _array in zip(_names, _arrays):
+        _inputs[_name] = _shared_rows(_array)
+
+        if _inputs[_name] is None:
+            _copy = shared_empty(shape)
+            _copy[...] = _array
+            _inputs[_name] = _shared_rows(_copy)
+
+    # the workers write into the out arrays themselves when they are shared, and into
+    # new shared arrays otherwise, which are returned without out
+    results = [] if out is None else [i if _shared_rows(i) else shared_empty(shape)
+                                      for i in out]
+    results += [shared_empty(shape) for _ in range(n_outputs - len(results))]
+
+    with ProcessPoolExecutor(min(workers, len(_bounds)), initializer=_init_worker,
+                             initargs=(func, _inputs, [_shared_rows(i) for i in results],
+                                       size, kwargs)) as pool:
+        for _future in [pool.submit(_run_chunk, *i) for i in _bounds]:
+            _future.result()
+
+    if out is None:
+        return tuple(results)
+
+    for _out, _result in zip(out, results):
+        if _out is not _result:
+            _out[...] = _result
+
+    return out
+
+
+def parallel_transform(longitude,
+                       latitude,
+                       from_frame: str,
+                       to_frame: str,
+                       workers: int = None,
+                       chunk_size: int = 250_000,
+                       out: Tuple[np_arr, np_arr] = None,
+                       obliquity: float = frames.OBLIQUITY) -> Tuple[np_arr, np_arr]:
+    """
+    frames.transform over worker processes, e.g. for equatorial to galactic.
+
+    Parameters
+    ----------
+    longitude :
+        Longitude-like coordinate in degrees.
+    latitude :
+        Latitude-like coordinate in degrees.
+    from_frame : str
+        Frame of the input coordinates, one of frames.FRAMES.
+    to_frame : str
+        Frame of the output coordinates, one of frames.FRAMES.
+    workers : int, optional
+        Number of worker processes. The default is None, for os.cpu_count().
+    chunk_size : int, optional
+        Number of rows per task. The default is 250_000.
+    out : Tuple[np_arr, np_arr], optional
+        Preallocated longitude and latitude arrays. The default is None.
+    obliquity : float, optional
+        The value for the obliquity of the ecliptic. The default is 23.43927944.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr]
+        Longitude and latitude of the target frame, in degrees.
+
+    """
+    return run_parallel(frames.transform, {'longitude': longitude, 'latitude': latitude},
+                        {'from_frame': frames._check_frame(from_frame),
+                         'to_frame': frames._check_frame(to_frame),
+                         'obliquity': obliquity},
+                        workers=workers, chunk_size=chunk_size, out=out)
+
+
+def parallel_equatorial2horizontal(observer_latitude: FloatStrArr,
+                                   declination: FloatStrArr,
+                                   right_ascension: FloatStrArr = None,
+                                   hour_angle: FloatStrArr = None,
+                                   local_time: FloatStrArr = None,
+                                   output_parameter: str = 'altitude',
+                                   workers: int = None,
+                                   chunk_size: int = 250_000,
+                                   out: Tuple[np_arr, np_arr] = None) -> Tuple[np_arr,
+                                                                               np_arr]:
+    """
+    celestial_coordinates.equatorial2horizontal_array over worker processes.
+
+    Parameters
+    ----------
+    observer_latitude : FloatStrArr
+        Latitude(s) of the observer.
+    declination : FloatStrArr
+        Declination(s) of the celestial objects.
+    right_ascension : FloatStrArr, optional
+        Right ascension(s) of the celestial objects. The default is None.
+    hour_angle : FloatStrArr, optional
+        Hour angle(s) of the celestial objects. The default is None.
+    local_time : FloatStrArr, optional
+        Local time(s) for the observer. The default is None.
+    output_parameter : str, optional
+        Whether to give altitude or zenith angle as output. The default is 'altitude'.
+    workers : int, optional
+        Number of worker processes. The default is None, for os.cpu_count().
+    chunk_size : int, optional
+        Number of rows per task. The default is 250_000.
+    out : Tuple[np_arr, np_arr], optional
+        Preallocated azimuth and altitude/zenith angle arrays. The default is None.
+
+    Raises
+    ------
+    IncompleteArguments
+        Raised if the argument set is not complete.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr]
+        Azimuth and altitude/zenith angle in degrees.
+
+    Notes
+    -------
+        Sexagesimal strings are parsed in the calling process before the split.
+
+    """
+    if hour_angle is None:
+        if right_ascension is None or local_time is None:
+            raise IncompleteArguments('Either hour_angle, or right_ascension with '
+                                      'local_time, must be provided.')
+
+        hour_angle = utils.ra2ha(right_ascension, local_time)
+
+    inputs = {'observer_latitude': utils.change_instance_array(observer_latitude),
+              'declination': utils.change_instance_array(declination),
+              'hour_angle': utils.change_instance_array(hour_angle, 'hms')}
+
+    return run_parallel(cc.equatorial2horizontal_array, inputs,
+                        {'output_parameter': output_parameter},
+                        workers=workers, chunk_size=chunk_size, out=out)
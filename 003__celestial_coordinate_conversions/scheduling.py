@@ -0,0 +1,187 @@
+"""
+Created on Oct 18 12:31:04 2026
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+import conversion_utilities as utils
+from conversion_errors import OutputTypeError
+
+np_arr = utils.np_arr
+FloatStr = utils.FloatStr
+FloatStrArr = utils.FloatStrArr
+
+
+def hour_angle_limit(declination: FloatStrArr,
+                     observer_latitude: FloatStr,
+                     altitude_limit: FloatStr = 0.) -> np_arr:
+    """
+    Compute the hour angle at which targets cross the given altitude, in closed form.
+
+    Parameters
+    ----------
+    declination : FloatStrArr
+        Declination(s) of the celestial objects.
+    observer_latitude : FloatStr
+        Latitude of the observer.
+    altitude_limit : FloatStr, optional
+        Altitude that the targets must be above. The default is 0.
+
+    Returns
+    -------
+    np_arr
+        Semi-arc H0 in degrees, so the target is above the limit for hour angles in
+        [-H0, H0]. It is 180 for targets that never go below the limit and NaN for
+        targets that never reach it.
+
+    """
+    _dec = np.radians(utils.change_instance_array(declination))
+    _lat = np.radians(utils.change_instance_array(observer_latitude))
+    _alt = np.radians(utils.change_instance_array(altitude_limit))
+
+    cos_h0 = np.sin(_alt) - np.sin(_lat) * np.sin(_dec)
+    cos_h0 /= np.cos(_lat) * np.cos(_dec)
+
+    h0 = np.degrees(np.arccos(np.clip(cos_h0, -1, 1)))
+
+    return np.where(cos_h0 > 1, np.nan, h0)
+
+
+def rise_transit_set(right_ascension: FloatStrArr,
+                     declination: FloatStrArr,
+                     observer_latitude: FloatStr,
+                     altitude_limit: FloatStr = 0.) -> Tuple[np_arr, np_arr, np_arr]:
+    """
+    Compute the local times of rise, transit and set for arrays of targets.
+
+    Parameters
+    ----------
+    right_ascension : FloatStrArr
+        Right ascension(s) of the celestial objects.
+    declination : FloatStrArr
+        Declination(s) of the celestial objects.
+    observer_latitude : FloatStr
+        Latitude of the observer.
+    altitude_limit : FloatStr, optional
+        Altitude that defines rising and setting. The default is 0.
+
+    Returns
+    -------
+    Tuple[np_arr, np_arr, np_arr]
+        Local times of rise, transit and set in degrees, wrapped to [0, 360). Rise and
+        set are NaN for targets that never cross the limit.
+
+    Notes
+    -------
+        The local time is the one used by equatorial2horizontal, i.e. the hour angle
+        is local_time - right_ascension.
+
+    """
+    _ra = utils.change_instance_array(right_ascension, 'hms')
+    h0 = hour_angle_limit(declination, observer_latitude, altitude_limit)
+
+    transit = np.mod(_ra, 360) + np.zeros_like(h0)
+    crossing = np.where(h0 < 180, h0, np.nan)
+
+    return np.mod(transit - crossing, 360), transit, np.mod(transit + crossing, 360)
+
+
+class VisibilityIndex:
+    """
+    VisibilityIndex answers "which targets are above the altitude limit between two
+    local times" without scanning the catalog.
+
+    Each target is up on one interval of local time. The intervals are copied one turn
+    before and after, sorted by their start, and a max-heap of their ends is built on
+    top. A query only descends into the branches holding intervals that start early
+    enough and end late enough, one level of the heap at a time. The cost grows with
+    the depth of the heap and the number of matches rather than with the catalog size.
+    """
+
+    def __init__(self, right_ascension: FloatStrArr, declination: FloatStrArr,
+                 observer_latitude: FloatStr, altitude_limit: FloatStr = 0.):
+        rise, _, _ = rise_transit_set(right_ascension, declination, observer_latitude,
+                                      altitude_limit)
+        h0 = hour_angle_limit(declination, observer_latitude, altitude_limit)
+        rise, h0 = np.broadcast_arrays(rise, h0)
+        rise, h0 = rise.ravel(), h0.ravel()
+
+        self.n_targets = h0.size
+        self.always_up = np.flatnonzero(h0 == 180)
+
+        _crossing = np.flatnonzero(h0 < 180)
+        _start, _length = rise[_crossing], 2 * h0[_crossing]
+
+        starts = np.concatenate([_start - 360, _start, _start + 360])
+        order = np.argsort(starts, kind='stable')
+
+        self._starts = starts[order]
+        self._ends = self._starts + np.tile(_length, 3)[order]
+        self._ids = np.tile(_crossing, 3)[order]
+
+        # heap levels from the root down to the (padded) leaves, holding the largest
+        # interval end below each node
+        _depth = max(int(np.ceil(np.log2(max(self._ends.size, 1)))), 0)
+        _leaves = np.full(2**_depth, -np.inf)
+        _leaves[:self._ends.size] = self._ends
+
+        self._levels = [_leaves]
+        while self._levels[0].size > 1:
+            self._levels.insert(0, self._levels[0].reshape(-1, 2).max(axis=1))
+
+    def _matching(self, start_limit: float, end_limit: float) -> np_arr:
+        """Sorted positions of intervals with start <= start_limit and end >= end_limit."""
+        n_prefix = np.searchsorted(self._starts, start_limit, side='right')
+        depth = len(self._levels) - 1
+
+        nodes = np.zeros(1, dtype=np.intp)
+
+        for level, max_end in enumerate(self._levels):
+            _first_leaf = nodes << (depth - level)
+            nodes = nodes[(max_end[nodes] >= end_limit) & (_first_leaf < n_prefix)]
+
+            if level < depth:
+                nodes = np.stack([2 * nodes, 2 * nodes + 1], axis=1).ravel()
+
+        return nodes
+
+    def query(self, start: FloatStr, end: FloatStr, mode: str = 'any') -> np_arr:
+        """
+        Find the targets above the altitude limit within a window of local time.
+
+        Parameters
+        ----------
+        start : FloatStr
+            Local time at the start of the window, in degrees or as an HMS string.
+        end : FloatStr
+            Local time at the end of the window. The window wraps through 24h if end is
+            before start.
+        mode : str, optional
+            'any' for targets up at some point of the window, 'all' for targets up
+            during the whole window. The default is 'any'.
+
+        Raises
+        ------
+        OutputTypeError
+            Raised if the mode is neither 'any' nor 'all'.
+
+        Returns
+        -------
+        np_arr
+            Sorted indices of the matching targets.
+
+        """
+        if mode not in ['any', 'all']:
+            raise OutputTypeError('The mode must either be \'any\' or \'all\'.')
+
+        _start = np.mod(utils.change_instance(start, 'hms'), 360)
+        _end = _start + np.mod(utils.change_instance(end, 'hms') - _start, 360)
+
+        if mode == 'any':
+            matches = self._matching(_end, _start)
+        else:
+            matches = self._matching(_start, _end)
+
+        return np.union1d(self._ids[matches], self.always_up)
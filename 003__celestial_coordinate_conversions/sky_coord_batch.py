@@ -0,0 +1,256 @@
+"""
+Created on Oct 18 17:38:12 2026
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+import conversion_utilities as utils
+import frames
+from caching import lru_cache
+from conversion_errors import IncompleteArguments, UnknownFrame
+
+np_arr = utils.np_arr
+FloatStrArr = utils.FloatStrArr
+
+BATCH_FRAMES = frames.FRAMES + ('horizontal',)
+
+
+@lru_cache('horizontal_matrix', maxsize=256)
+def _horizontal_matrix(observer_latitude: float, local_time: float) -> np_arr:
+    """
+    Rotation matrix taking equatorial unit vectors to horizontal ones, for an observer
+    latitude and local time in degrees.
+    """
+    _lat, _lt = np.radians([observer_latitude, local_time])
+
+    # (RA, Dec) -> (hour angle, Dec), with hour angle = local_time - RA
+    _hour_angle = np.array([[np.cos(_lt), np.sin(_lt), 0],
+                            [np.sin(_lt), -np.cos(_lt), 0],
+                            [0, 0, 1]])
+
+    # (hour angle, Dec) -> (azimuth, altitude), with the azimuth of
+    # celestial_coordinates.equatorial2horizontal for a northern observer
+    _horizontal = np.array([[-np.sin(_lat), 0, np.cos(_lat)],
+                            [0, -1, 0],
+                            [np.cos(_lat), 0, np.sin(_lat)]])
+
+    matrix = _horizontal @ _hour_angle
+    matrix.setflags(write=False)
+
+    return matrix
+
+
+class SkyCoordBatch:
+    """
+    SkyCoordBatch holds a batch of positions in one frame, as the sin and cos of their
+    longitude and latitude. A frame conversion is one matrix multiply of the unit
+    vectors, which are built from the stored sin/cos without any trig, and the new
+    sin/cos are read back from the rotated vectors. Angles are only evaluated, with
+    arctan2, when they are asked for, so chained conversions such as horizontal ->
+    equatorial -> galactic stay in unit vectors throughout.
+
+    The frames are those of frames.FRAMES plus 'horizontal', where the longitude is the
+    azimuth and the latitude the altitude, with the conventions of
+    celestial_coordinates.equatorial2horizontal. The horizontal frame needs the
+    observer latitude and local time.
+    """
+
+    __slots__ = ('frame', 'observer_latitude', 'local_time',
+                 '_sin_lon', '_cos_lon', '_sin_lat', '_cos_lat')
+
+    def __init__(self, longitude: FloatStrArr, latitude: FloatStrArr,
+                 frame: str = 'equatorial', observer_latitude: float = None,
+                 local_time: float = None, deg_rad: str = 'deg'):
+        """
+        Parameters
+        ----------
+        longitude : FloatStrArr
+            Longitude-like coordinates (RA, ecliptic or galactic longitude, azimuth),
+            as floats or HMS (for RA) / DMS strings.
+        latitude : FloatStrArr
+            Latitude-like coordinates (Dec, ecliptic or galactic latitude, altitude),
+            as floats or DMS strings.
+        frame : str, optional
+            Frame of the coordinates, one of BATCH_FRAMES. The default is 'equatorial'.
+        observer_latitude : float, optional
+            Latitude of the observer in degrees, for the horizontal frame. The default
+            is None.
+        local_time : float, optional
+            Local time of the observer in degrees, for the horizontal frame. The
+            default is None.
+        deg_rad : str, optional
+            Whether the float inputs are in degrees or radians. The default is 'deg'.
+
+        """
+        self.frame = self._check_frame(frame)
+        self._set_observer(observer_latitude, local_time)
+
+        longitude = utils.change_instance_array(longitude, 'hms' if self.frame ==
+                                                'equatorial' else 'dms')
+        latitude = utils.change_instance_array(latitude)
+
+        if deg_rad == 'deg':
+            longitude, latitude = np.radians(longitude), np.radians(latitude)
+
+        longitude, latitude = np.broadcast_arrays(longitude, latitude)
+
+        if self.southern:
+            longitude = np.pi - longitude
+
+        self._sin_lon, self._cos_lon = np.sin(longitude), np.cos(longitude)
+        self._sin_lat, self._cos_lat = np.sin(latitude), np.cos(latitude)
+
+    @staticmethod
+    def _check_frame(frame: str) -> str:
+        frame = frame.lower()
+
+        if frame not in BATCH_FRAMES:
+            raise UnknownFrame(f'The frame must be one of {", ".join(BATCH_FRAMES)}.')
+
+        return frame
+
+    def _set_observer(self, observer_latitude: float, local_time: float):
+        if self.frame == 'horizontal' and None in [observer_latitude, local_time]:
+            raise IncompleteArguments('The horizontal frame needs both '
+                                      'observer_latitude and local_time.')
+
+        self.observer_latitude = (None if observer_latitude is None else
+                                  float(utils.change_instance(observer_latitude)))
+        self.local_time = (None if local_time is None else
+                           float(utils.change_instance(local_time, 'hms')))
+
+    @property
+    def southern(self) -> bool:
+        """Whether the azimuth follows the southern convention, 180 - azimuth."""
+        return self.frame == 'horizontal' and self.observer_latitude < 0
+
+    @classmethod
+    def from_unit_vectors(cls, vectors: np_arr, frame: str = 'equatorial',
+                          observer_latitude: float = None,
+                          local_time: float = None) -> 'SkyCoordBatch':
+        """Build a batch from unit vectors with shape (..., 3), without any trig."""
+        batch = cls.__new__(cls)
+        batch.frame = cls._check_frame(frame)
+        batch._set_observer(observer_latitude, local_time)
+
+        x, y, z = np.moveaxis(vectors, -1, 0)
+        _cos_lat = np.hypot(x, y)
+
+        # the longitude is undefined at the poles, where it is set to 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            _pole = _cos_lat == 0
+            batch._cos_lon = np.where(_pole, 1., x / _cos_lat)
+            batch._sin_lon = np.where(_pole, 0., y / _cos_lat)
+
+        batch._sin_lat, batch._cos_lat = z, _cos_lat
+
+        return batch
+
+    def __len__(self):
+        return self._sin_lat.size
+
+    def __repr__(self):
+        return f'SkyCoordBatch(frame={self.frame!r}, size={len(self)})'
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._sin_lat.shape
+
+    @property
+    def longitude(self) -> np_arr:
+        """Longitude-like coordinate in radians, in [0, 2pi) or, for azimuths, as
+        given by equatorial2horizontal."""
+        longitude = np.arctan2(self._sin_lon, self._cos_lon)
+
+        if self.frame != 'horizontal':
+            return np.mod(longitude, 2 * np.pi)
+
+        return np.pi - longitude if self.southern else longitude
+
+    @property
+    def latitude(self) -> np_arr:
+        """Latitude-like coordinate in radians."""
+        return np.arctan2(self._sin_lat, self._cos_lat)
+
+    def sin_cos(self) -> Tuple[np_arr, np_arr, np_arr, np_arr]:
+        """sin and cos of the longitude and of the latitude, as stored."""
+        return self._sin_lon, self._cos_lon, self._sin_lat, self._cos_lat
+
+    def unit_vectors(self) -> np_arr:
+        """Unit vectors with shape (..., 3), built without any trig."""
+        return np.stack([self._cos_lat * self._cos_lon, self._cos_lat * self._sin_lon,
+                         self._sin_lat], axis=-1)
+
+    def _from_equatorial(self) -> np_arr:
+        """Rotation matrix taking equatorial unit vectors to this frame."""
+        if self.frame == 'horizontal':
+            return _horizontal_matrix(self.observer_latitude, self.local_time)
+
+        return frames.rotation_matrix('equatorial', self.frame)
+
+    def to(self, frame: str, observer_latitude: float = None,
+           local_time: float = None) -> 'SkyCoordBatch':
+        """
+        Convert the batch to another frame.
+
+        Parameters
+        ----------
+        frame : str
+            Target frame, one of BATCH_FRAMES.
+        observer_latitude : float, optional
+            Latitude of the observer in degrees, for a horizontal target. The default
+            is None, to keep the one of this batch.
+        local_time : float, optional
+            Local time of the observer in degrees, for a horizontal target. The default
+            is None, to keep the one of this batch.
+
+        Raises
+        ------
+        UnknownFrame
+            Raised if the frame is not in BATCH_FRAMES.
+        IncompleteArguments
+            Raised if the horizontal frame lacks the observer latitude or local time.
+
+        Returns
+        -------
+        SkyCoordBatch
+            A new batch in the target frame.
+
+        """
+        frame = self._check_frame(frame)
+
+        observer_latitude = (self.observer_latitude if observer_latitude is None else
+                             observer_latitude)
+        local_time = self.local_time if local_time is None else local_time
+
+        target = SkyCoordBatch.__new__(SkyCoordBatch)
+        target.frame = frame
+        target._set_observer(observer_latitude, local_time)
+
+        if frame == self.frame and (frame != 'horizontal' or
+                                    (target.observer_latitude, target.local_time) ==
+                                    (self.observer_latitude, self.local_time)):
+            return self
+
+        matrix = target._from_equatorial() @ self._from_equatorial().T
+
+        return SkyCoordBatch.from_unit_vectors(self.unit_vectors() @ matrix.T, frame,
+                                               target.observer_latitude,
+                                               target.local_time)
+
+    def degrees(self) -> Tuple[np_arr, np_arr]:
+        """Longitude and latitude in degrees."""
+        return np.degrees(self.longitude), np.degrees(self.latitude)
+
+    def strings(self, precision: int = 4) -> Tuple[np_arr, np_arr]:
+        """Longitude and latitude as HMS (for RA) and DMS strings."""
+        longitude, latitude = self.degrees()
+
+        if self.frame == 'equatorial':
+            return (utils.dd2hms_array(longitude, precision),
+                    utils.dd2dms_array(latitude, precision))
+
+        return (utils.dd2dms_array(longitude, precision, degree_digits=3),
+                utils.dd2dms_array(latitude, precision))
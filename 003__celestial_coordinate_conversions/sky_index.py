@@ -0,0 +1,170 @@
+"""
+Created on Oct 18 14:40:26 2026
+"""
+
+import pickle
+from typing import List, Tuple, Union
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+import conversion_utilities as utils
+import frames
+
+np_arr = utils.np_arr
+
+
+def _chord(radius) -> np_arr:
+    """Chord length on the unit sphere for an angular radius in degrees."""
+    return 2 * np.sin(np.radians(np.minimum(radius, 180)) / 2)
+
+
+def _angle(chord) -> np_arr:
+    """Angular separation in degrees for a chord length on the unit sphere."""
+    return np.degrees(2 * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1)))
+
+
+class SkyIndex:
+    """
+    SkyIndex is a k-d tree on the unit vectors of a catalog. On the sphere, the
+    straight-line (chord) distance grows with the angular separation, so cone
+    searches, nearest neighbours and cross-matches become Euclidean tree queries that
+    cost O(log N) each.
+    """
+
+    def __init__(self, longitude, latitude, frame: str = 'equatorial',
+                 leafsize: int = 16):
+        """
+        Parameters
+        ----------
+        longitude :
+            Longitudes of the catalog, in degrees.
+        latitude :
+            Latitudes of the catalog, in degrees.
+        frame : str, optional
+            Frame of the catalog coordinates, one of frames.FRAMES. The default is
+            'equatorial'.
+        leafsize : int, optional
+            Number of points at which the tree switches to brute force. The default
+            is 16.
+
+        """
+        self.frame = frames._check_frame(frame)
+
+        vectors = self._vectors(longitude, latitude).reshape(-1, 3)
+        self.tree = cKDTree(vectors, leafsize=leafsize)
+
+    def __len__(self):
+        return self.tree.n
+
+    def _vectors(self, longitude, latitude, frame: str = None) -> np_arr:
+        """Unit vectors in the frame of the index for positions in degrees."""
+        if frame is not None and frames._check_frame(frame) != self.frame:
+            longitude, latitude = frames.transform(longitude, latitude, frame,
+                                                   self.frame)
+
+        return frames.spherical2unit(np.radians(longitude), np.radians(latitude))
+
+    def cone_search(self, longitude, latitude, radius: float,
+                    frame: str = None) -> Union[np_arr, List[np_arr]]:
+        """
+        Find the catalog entries within a radius of one or more positions.
+
+        Parameters
+        ----------
+        longitude :
+            Longitude(s) of the cone centres, in degrees.
+        latitude :
+            Latitude(s) of the cone centres, in degrees.
+        radius : float
+            Radius of the cone, in degrees.
+        frame : str, optional
+            Frame of the given positions if it differs from the one of the index.
+
+        Returns
+        -------
+        Union[np_arr, List[np_arr]]
+            Sorted indices of the entries in the cone, or one such array per centre
+            when several centres are given.
+
+        """
+        vectors = self._vectors(longitude, latitude, frame)
+        found = self.tree.query_ball_point(vectors, _chord(radius), return_sorted=True)
+
+        if vectors.ndim == 1:
+            return np.asarray(found, dtype=np.intp)
+
+        return [np.asarray(i, dtype=np.intp) for i in found.ravel()]
+
+    def nearest(self, longitude, latitude, k: int = 1,
+                frame: str = None) -> Tuple[np_arr, np_arr]:
+        """
+        Find the k nearest catalog entries of one or more positions.
+
+        Parameters
+        ----------
+        longitude :
+            Longitude(s) of the positions, in degrees.
+        latitude :
+            Latitude(s) of the positions, in degrees.
+        k : int, optional
+            Number of neighbours. The default is 1.
+        frame : str, optional
+            Frame of the given positions if it differs from the one of the index.
+
+        Returns
+        -------
+        Tuple[np_arr, np_arr]
+            Angular separations in degrees and indices of the neighbours, with a
+            trailing axis of length k when k > 1.
+
+        """
+        chord, index = self.tree.query(self._vectors(longitude, latitude, frame), k=k)
+
+        return _angle(chord), index
+
+    def cross_match(self, longitude, latitude, radius: float,
+                    frame: str = None) -> Tuple[np_arr, np_arr, np_arr]:
+        """
+        Match every position of another catalog to its nearest entry within a radius.
+
+        Parameters
+        ----------
+        longitude :
+            Longitudes of the other catalog, in degrees.
+        latitude :
+            Latitudes of the other catalog, in degrees.
+        radius : float
+            Matching radius, in degrees.
+        frame : str, optional
+            Frame of the other catalog if it differs from the one of the index.
+
+        Returns
+        -------
+        Tuple[np_arr, np_arr, np_arr]
+            Indices in the other catalog, indices of their matches in the index, and
+            the angular separations in degrees, for the matched positions only.
+
+        Notes
+        -------
+            Building the index is O(N log N) and matching M positions O(M log N).
+
+        """
+        vectors = self._vectors(longitude, latitude, frame).reshape(-1, 3)
+        chord, index = self.tree.query(vectors, k=1,
+                                       distance_upper_bound=_chord(radius) * (1 + 1e-12))
+
+        matched = np.flatnonzero(np.isfinite(chord))
+
+        return matched, index[matched], _angle(chord[matched])
+
+    def save(self, path: str):
+        """Write the index, tree included, to a file."""
+        with open(path, 'wb') as _file:
+            pickle.dump(self, _file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'SkyIndex':
+        """Read an index written by save, without rebuilding the tree."""
+        with open(path, 'rb') as _file:
+            return pickle.load(_file)
@@ -0,0 +1,198 @@
+"""
+Created on Oct 18 18:20:44 2026
+"""
+
+from typing import NamedTuple, Sequence, Union
+
+import numpy as np
+
+import celestial_coordinates as cc
+import conversion_utilities as utils
+import frames
+from conversion_errors import IncompleteArguments, UnknownFrame
+
+np_arr = utils.np_arr
+
+Seed = Union[None, int, np.random.Generator]
+
+
+class UncertaintySummary(NamedTuple):
+    """
+    Statistics of the converted samples, one row per input position. Angles are in
+    degrees and the covariance is in square degrees of (longitude, latitude), with the
+    longitude deviations taken around the circular mean.
+    """
+    longitude: np_arr
+    latitude: np_arr
+    covariance: np_arr
+    levels: np_arr
+    longitude_percentiles: np_arr
+    latitude_percentiles: np_arr
+
+    @property
+    def sigma_longitude(self) -> np_arr:
+        return np.sqrt(self.covariance[:, 0, 0])
+
+    @property
+    def sigma_latitude(self) -> np_arr:
+        return np.sqrt(self.covariance[:, 1, 1])
+
+
+def _convert(longitude: np_arr, latitude: np_arr, from_frame: str, to_frame: str,
+             observer_latitude: float, local_time: np_arr):
+    """Convert a (rows, samples) block of positions to the target frame."""
+    if to_frame != 'horizontal':
+        return frames.transform(longitude, latitude, from_frame, to_frame)
+
+    if from_frame != 'equatorial':
+        longitude, latitude = frames.transform(longitude, latitude, from_frame,
+                                               'equatorial')
+
+    return cc.equatorial2horizontal_array(observer_latitude, latitude,
+                                          hour_angle=local_time[:, None] - longitude)
+
+
+def propagate(longitude,
+              latitude,
+              sigma_longitude,
+              sigma_latitude,
+              to_frame: str = 'galactic',
+              from_frame: str = 'equatorial',
+              n_samples: int = 1000,
+              correlation=0.,
+              levels: Sequence[float] = (2.5, 50., 97.5),
+              rng: Seed = None,
+              chunk_size: int = 1_000_000,
+              observer_latitude: float = None,
+              local_time=None) -> UncertaintySummary:
+    """
+    Propagate Gaussian coordinate uncertainties through a conversion by Monte Carlo.
+
+    Parameters
+    ----------
+    longitude :
+        Longitude-like input coordinates (e.g. RA), in degrees.
+    latitude :
+        Latitude-like input coordinates (e.g. Dec), in degrees.
+    sigma_longitude :
+        Standard deviation of the longitudes, in degrees of the coordinate itself
+        (not multiplied by cos(latitude)).
+    sigma_latitude :
+        Standard deviation of the latitudes, in degrees.
+    to_frame : str, optional
+        One of frames.FRAMES or 'horizontal'. The default is 'galactic'.
+    from_frame : str, optional
+        One of frames.FRAMES. The default is 'equatorial'.
+    n_samples : int, optional
+        Number of samples K drawn per position. The default is 1000.
+    correlation : optional
+        Correlation coefficient of the longitude and latitude errors. The default is 0.
+    levels : Sequence[float], optional
+        Percentiles to report, in [0, 100]. The default is (2.5, 50., 97.5).
+    rng : Seed, optional
+        Seed or numpy Generator. The samples do not depend on chunk_size, so a seed
+        reproduces the results exactly. The default is None.
+    chunk_size : int, optional
+        Largest number of samples (positions x K) converted at once, which bounds the
+        memory use. The default is 1_000_000.
+    observer_latitude : float, optional
+        Latitude of the observer, for the horizontal frame. The default is None.
+    local_time : optional
+        Local time(s) of the observer in degrees, one per position or shared, for the
+        horizontal frame. The default is None.
+
+    Raises
+    ------
+    UnknownFrame
+        Raised if a frame is not recognised.
+    IncompleteArguments
+        Raised if the horizontal frame lacks the observer latitude or local time.
+
+    Returns
+    -------
+    UncertaintySummary
+        Circular mean longitude, mean latitude, covariance matrices and percentiles of
+        the converted positions.
+
+    """
+    from_frame = frames._check_frame(from_frame)
+    to_frame = to_frame.lower()
+
+    if to_frame not in frames.FRAMES + ('horizontal',):
+        raise UnknownFrame(f'The target frame must be one of '
+                           f'{", ".join(frames.FRAMES)} or horizontal.')
+
+    if to_frame == 'horizontal' and None in [observer_latitude, local_time]:
+        raise IncompleteArguments('The horizontal frame needs both observer_latitude '
+                                  'and local_time.')
+
+    rng = np.random.default_rng(rng)
+    levels = np.asarray(levels, dtype=float)
+
+    inputs = np.broadcast_arrays(*[np.asarray(i, dtype=float).ravel() for i in
+                                   [longitude, latitude, sigma_longitude,
+                                    sigma_latitude, correlation]])
+    _lon, _lat, _sigma_lon, _sigma_lat, _rho = inputs
+    n_values = _lon.size
+
+    local_time = np.broadcast_to(np.asarray(0. if local_time is None else local_time,
+                                            dtype=float).ravel(), (n_values,))
+
+    mean_lon, mean_lat = np.empty(n_values), np.empty(n_values)
+    covariance = np.empty((n_values, 2, 2))
+    lon_percentiles = np.empty((n_values, levels.size))
+    lat_percentiles = np.empty((n_values, levels.size))
+
+    rows = max(chunk_size // n_samples, 1)
+
+    for start in range(0, n_values, rows):
+        _rows = slice(start, min(start + rows, n_values))
+
+        # one draw of shape (rows, K, 2) per chunk keeps the stream independent of the
+        # chunking
+        _z = rng.standard_normal((_rows.stop - start, n_samples, 2))
+        _z1, _z2 = _z[..., 0], _z[..., 1]
+
+        _rho_r = _rho[_rows, None]
+        _z2 = _rho_r * _z1 + np.sqrt(1 - _rho_r**2) * _z2
+
+        lon_samples = _lon[_rows, None] + _sigma_lon[_rows, None] * _z1
+        lat_samples = _lat[_rows, None] + _sigma_lat[_rows, None] * _z2
+
+        # samples pushed over a pole are folded back onto the sphere
+        _over = np.abs(lat_samples) > 90
+        lat_samples = np.where(_over, np.sign(lat_samples) * 180 - lat_samples,
+                               lat_samples)
+        lon_samples = np.where(_over, lon_samples + 180, lon_samples)
+
+        out_lon, out_lat = _convert(lon_samples, lat_samples, from_frame, to_frame,
+                                    observer_latitude, local_time[_rows])
+
+        _radians = np.radians(out_lon)
+        _mean = np.degrees(np.arctan2(np.sin(_radians).mean(axis=1),
+                                      np.cos(_radians).mean(axis=1)))
+
+        # on the branch of the converted longitudes, so azimuths keep the convention
+        # of equatorial2horizontal
+        _mean = out_lon[:, 0] + np.mod(_mean - out_lon[:, 0] + 180, 360) - 180
+        if to_frame != 'horizontal':
+            _mean = np.mod(_mean, 360)
+
+        # longitude deviations wrapped to [-180, 180) around the circular mean
+        _dlon = np.mod(out_lon - _mean[:, None] + 180, 360) - 180
+        _dlat = out_lat - out_lat.mean(axis=1, keepdims=True)
+
+        mean_lon[_rows], mean_lat[_rows] = _mean, out_lat.mean(axis=1)
+
+        _scale = 1 / max(n_samples - 1, 1)
+        covariance[_rows, 0, 0] = np.einsum('ij,ij->i', _dlon, _dlon) * _scale
+        covariance[_rows, 1, 1] = np.einsum('ij,ij->i', _dlat, _dlat) * _scale
+        covariance[_rows, 0, 1] = np.einsum('ij,ij->i', _dlon, _dlat) * _scale
+        covariance[_rows, 1, 0] = covariance[_rows, 0, 1]
+
+        lon_percentiles[_rows] = (np.percentile(_dlon, levels, axis=1).T +
+                                  _mean[:, None])
+        lat_percentiles[_rows] = np.percentile(out_lat, levels, axis=1).T
+
+    return UncertaintySummary(mean_lon, mean_lat, covariance, levels, lon_percentiles,
+                              lat_percentiles)
@@ -0,0 +1,190 @@
+"""
+Created on Oct 18 19:02:27 2026
+"""
+
+from typing import Callable, Iterator, Tuple
+
+import numpy as np
+
+import error_utilities as e_utils
+
+Block = Tuple[int, int, np.ndarray]
+
+
+def _squared_norm(difference_x, difference_y, difference_z):
+    """dx^2 + dy^2 + dz^2, accumulated in place in the first difference."""
+    difference_x *= difference_x
+    difference_y *= difference_y
+    difference_z *= difference_z
+
+    difference_x += difference_y
+    difference_x += difference_z
+
+    return difference_x
+
+
+def _finish(squared_distance, squared: bool):
+    return squared_distance if squared else np.sqrt(squared_distance,
+                                                    out=squared_distance)
+
+
+def distances(points, reference=(0, 0, 0), squared: bool = False) -> np.ndarray:
+    """
+    Euclidean distances of a point set from one reference point, or between paired
+    point sets.
+
+    Parameters
+    ----------
+    points :
+        An (N, d) array of points, d being 1, 2 or 3. Missing y and z are taken as 0.
+    reference :
+        A single point, or an (N, d) array paired row by row with points. Default is
+        (0, 0, 0).
+    squared : bool, optional
+        Return the squared distances, skipping the square root. The default is False.
+
+    Returns
+    -------
+    np.ndarray
+        The N distances.
+
+    """
+    points, reference = e_utils.pad_points_3d(points), e_utils.pad_points_3d(reference)
+
+    difference = points - reference
+
+    return _finish(_squared_norm(*difference.T.copy()), squared)
+
+
+def distance_blocks(points_a, points_b=None, block_size: int = 1024,
+                    squared: bool = False) -> Iterator[Block]:
+    """
+    All-pairs distances, in blocks of at most block_size x block_size, so the memory
+    used does not grow with N x M.
+
+    Parameters
+    ----------
+    points_a :
+        An (N, d) array of points, d being 1, 2 or 3.
+    points_b : optional
+        An (M, d) array of points. If None, the pairs within points_a are given, and
+        only the blocks on and above the diagonal are yielded. The default is None.
+    block_size : int, optional
+        Number of rows and columns per block. The default is 1024.
+    squared : bool, optional
+        Give the squared distances, skipping the square root. The default is False.
+
+    Yields
+    ------
+    Block
+        (i, j, block), block[k, l] being the distance between points_a[i + k] and
+        points_b[j + l].
+
+    """
+    points_a = e_utils.pad_points_3d(points_a)
+    single = points_b is None
+    points_b = points_a if single else e_utils.pad_points_3d(points_b)
+
+    # columns as contiguous coordinate arrays, so each block is three outer differences
+    _a, _b = points_a.T.copy(), points_b.T.copy()
+
+    for i in range(0, _a.shape[1], block_size):
+        _ai = _a[:, i:i + block_size, None]
+
+        for j in range(i if single else 0, _b.shape[1], block_size):
+            _bj = _b[:, None, j:j + block_size]
+
+            yield i, j, _finish(_squared_norm(*(_ai - _bj)), squared)
+
+
+def pairwise_distances(points_a, points_b=None, block_size: int = 1024,
+                       squared: bool = False,
+                       callback: Callable[[int, int, np.ndarray], None] = None):
+    """
+    N x M distances between two point sets, or within one.
+
+    Parameters
+    ----------
+    points_a :
+        An (N, d) array of points, d being 1, 2 or 3.
+    points_b : optional
+        An (M, d) array of points. The default is None, to use points_a.
+    block_size : int, optional
+        Number of rows and columns per block. The default is 1024.
+    squared : bool, optional
+        Give the squared distances, skipping the square root. The default is False.
+    callback : optional
+        A function called with (i, j, block) for every block of distance_blocks, in
+        which case nothing is stored and None is returned. The default is None.
+
+    Returns
+    -------
+    np.ndarray
+        The (N, M) distance matrix, or None if a callback is given.
+
+    """
+    if callback is not None:
+        for i, j, block in distance_blocks(points_a, points_b, block_size, squared):
+            callback(i, j, block)
+
+        return None
+
+    points_a = e_utils.pad_points_3d(points_a)
+    points_b = points_a if points_b is None else e_utils.pad_points_3d(points_b)
+
+    matrix = np.empty((len(points_a), len(points_b)))
+
+    for i, j, block in distance_blocks(points_a, points_b, block_size, squared):
+        matrix[i:i + block.shape[0], j:j + block.shape[1]] = block
+
+    return matrix
+
+
+def nearest(points_a, points_b=None, block_size: int = 1024,
+            squared: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nearest neighbour of every point of points_a, reduced block by block so the N x M
+    distances are never stored.
+
+    Parameters
+    ----------
+    points_a :
+        An (N, d) array of points, d being 1, 2 or 3.
+    points_b : optional
+        An (M, d) array of points to search. If None, the nearest other point of
+        points_a is found, each point being excluded from its own search. The default
+        is None.
+    block_size : int, optional
+        Number of rows and columns per block. The default is 1024.
+    squared : bool, optional
+        Give the squared distances, skipping the square root. The default is False.
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The N nearest distances, and the indices of the nearest points in points_b
+        (or points_a). Both are inf and -1 if there is no other point.
+
+    """
+    single = points_b is None
+    points_a = e_utils.pad_points_3d(points_a)
+    points_b = points_a if single else e_utils.pad_points_3d(points_b)
+
+    best = np.full(len(points_a), np.inf)
+    index = np.full(len(points_a), -1, dtype=np.intp)
+
+    # every block, not only the upper ones, so each row sees all its columns; the sqrt
+    # is only taken on the N minima
+    for i, j, block in distance_blocks(points_a, points_b, block_size, squared=True):
+        if single and i == j:
+            np.fill_diagonal(block, np.inf)
+
+        _rows = slice(i, i + block.shape[0])
+        _arg = block.argmin(axis=1)
+        _min = block[np.arange(block.shape[0]), _arg]
+
+        _better = _min < best[_rows]
+        best[_rows] = np.where(_better, _min, best[_rows])
+        index[_rows] = np.where(_better, _arg + j, index[_rows])
+
+    return _finish(best, squared), index
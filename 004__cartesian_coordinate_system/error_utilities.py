@@ -2,6 +2,8 @@
 Created on Thu Apr  1 01:31:56 2021
 """
 
+import numpy as np
+
 
 class CartesianCoordinateSystemErorClass(Exception):
     pass
@@ -47,3 +49,46 @@ def check_list_len_3d(list_to_check):
         _list_to_check.append(0)
 
     return _list_to_check
+
+
+class TooManyCoordinates(CartesianCoordinateSystemErorClass):
+    pass
+
+
+def pad_points_3d(points):
+    """
+    Bulk version of check_list_len_3d for point sets.
+
+    Parameters
+    ----------
+    points :
+        A single point or an (N, d) array of points, with d = 1, 2 or 3.
+
+    Raises
+    ------
+    EmptyList
+        Raised if no coordinate is given.
+    TooManyCoordinates
+        Raised if the points have more than 3 coordinates.
+
+    Returns
+    -------
+    np.ndarray
+        An (N, 3) float array, the missing y and z columns being 0.
+
+    """
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+
+    if points.size == 0:
+        raise EmptyList('Empty list passed.')
+
+    if points.shape[-1] > 3:
+        raise TooManyCoordinates('Points must have at most 3 coordinates.')
+
+    if points.shape[-1] == 3:
+        return points
+
+    padded = np.zeros(points.shape[:-1] + (3,))
+    padded[..., :points.shape[-1]] = points
+
+    return padded
@@ -0,0 +1,138 @@
+"""
+Created on Oct 18 19:24:51 2026
+"""
+
+from typing import List, Tuple, Union
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+import distance_engine
+import error_utilities as e_utils
+
+
+class SpatialIndex:
+    """
+    SpatialIndex is a k-d tree on a set of points in 3 or less dimensional space.
+    Neighbour and radius queries cost O(log N) per query point instead of the O(N)
+    scan of distance_formula, and a batch of query points is answered in one call.
+    """
+
+    def __init__(self, points, leafsize: int = 16):
+        """
+        Parameters
+        ----------
+        points :
+            An (N, d) array of points, d being 1, 2 or 3. Missing y and z are taken as
+            0.
+        leafsize : int, optional
+            Number of points at which the tree switches to brute force. The default
+            is 16.
+
+        """
+        self.points = e_utils.pad_points_3d(points)
+        self.tree = cKDTree(self.points, leafsize=leafsize)
+
+    def __len__(self):
+        return self.tree.n
+
+    def nearest(self, points, k: int = 1,
+                workers: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest indexed points of one or more query points.
+
+        Parameters
+        ----------
+        points :
+            A single point or an (M, d) array of query points.
+        k : int, optional
+            Number of neighbours. The default is 1.
+        workers : int, optional
+            Number of threads for a batch of query points, -1 for all the CPUs. The
+            default is 1.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Distances and indices of the neighbours, with a trailing axis of length k
+            when k > 1. Missing neighbours (k > N) have an inf distance and index N.
+
+        """
+        distance, index = self.tree.query(e_utils.pad_points_3d(points), k=k,
+                                          workers=workers)
+
+        if np.ndim(points) == 1:
+            return distance[0], index[0]
+
+        return distance, index
+
+    def within_radius(self, points, radius: float, workers: int = 1,
+                      count_only: bool = False) -> Union[np.ndarray, List[np.ndarray]]:
+        """
+        Find the indexed points within a radius of one or more query points.
+
+        Parameters
+        ----------
+        points :
+            A single point or an (M, d) array of query points.
+        radius : float
+            Search radius.
+        workers : int, optional
+            Number of threads for a batch of query points, -1 for all the CPUs. The
+            default is 1.
+        count_only : bool, optional
+            Only count the points in each sphere. The default is False.
+
+        Returns
+        -------
+        Union[np.ndarray, List[np.ndarray]]
+            Sorted indices of the points within the radius, or one such array per
+            query point when several are given. With count_only, the number of points
+            instead.
+
+        """
+        found = self.tree.query_ball_point(e_utils.pad_points_3d(points), radius,
+                                           workers=workers, return_sorted=True,
+                                           return_length=count_only)
+
+        if count_only:
+            return found[0] if np.ndim(points) == 1 else found
+
+        found = [np.asarray(i, dtype=np.intp) for i in found]
+
+        return found[0] if np.ndim(points) == 1 else found
+
+    def pairs_within(self, radius: float,
+                     other: 'SpatialIndex' = None) -> Tuple[np.ndarray, np.ndarray,
+                                                            np.ndarray]:
+        """
+        Find every pair of points closer than a radius.
+
+        Parameters
+        ----------
+        radius : float
+            Largest distance of a pair.
+        other : SpatialIndex, optional
+            A second index to pair with. The default is None, for the pairs within
+            this index.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray, np.ndarray]
+            Indices i in this index, j in other (or in this index, with i < j), and the
+            distances of the pairs, sorted by i then j.
+
+        """
+        if other is None:
+            pairs = self.tree.query_pairs(radius, output_type='ndarray')
+            i, j = pairs[:, 0], pairs[:, 1]
+            distance = distance_engine.distances(self.points[i], self.points[j])
+        else:
+            pairs = self.tree.sparse_distance_matrix(other.tree, radius,
+                                                     output_type='ndarray')
+            i, j, distance = pairs['i'], pairs['j'], pairs['v']
+
+        _order = np.lexsort((j, i))
+
+        return (i[_order].astype(np.intp), j[_order].astype(np.intp),
+                distance[_order])
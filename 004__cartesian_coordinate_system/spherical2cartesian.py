@@ -5,39 +5,64 @@ Created on May 12 22:47:36 2022
 import numpy as np
 
 
-def spherical2cartesian(spherical_coordinates, deg_rad: str = 'rad'):
+def spherical2cartesian(spherical_coordinates, deg_rad: str = 'rad', out=None):
     """
     Converts spherical coordinates to Cartesian/rectangular coordinates.
 
     Parameters
     ----------
     spherical_coordinates:
-        A tuple containing spherical coordinates.
+        A tuple containing spherical coordinates, or an (N, 3) array of points, one
+        (rho, theta, phi) per row.
     deg_rad: str, optional
         Indication whether the input coordinates are in degrees or radians. The default
         is 'rad'.
+    out: optional
+        A preallocated (N, 3) float array for the (x, y, z) rows, or a (3,) array for
+        a single point. It may be the input array itself. The default is None.
 
     Returns
     -------
     list:
-        Cartesian coordinates of the input spherical coordinates.
+        Cartesian coordinates of the input spherical coordinates, as a tuple for a
+        single point or as an (N, 3) array of (x, y, z) rows.
 
     """
 
-    # convert from degrees to radians (only theta and phi parameters)
+    coordinates = np.asarray(spherical_coordinates, dtype=float)
+
+    if coordinates.ndim == 1:
+        _out = np.empty(3) if out is None else out
+        spherical2cartesian(coordinates[None], deg_rad, _out[None])
+
+        return tuple(_out)
+
+    if out is None:
+        out = np.empty(coordinates.shape)
+
+    # initialize the coordinates, as column views
+    rho, theta, phi = np.moveaxis(coordinates, -1, 0)
+    x, y, z = np.moveaxis(out, -1, 0)
 
+    # convert from degrees to radians (only theta and phi parameters)
     if deg_rad == 'deg':
-        cs__ = np.deg2rad(spherical_coordinates[1:])
-        cs_ = np.append(spherical_coordinates[0], cs__)
-    else:
-        cs_ = np.array(spherical_coordinates)
+        theta, phi = np.radians(theta), np.radians(phi)
+
+    # every input column is read before out is written, so that out may be the input
+    # array itself
+
+    # rho * sin(phi), shared by x and y
+    _r_xy = np.sin(phi)
+    _r_xy *= rho
+
+    _z = np.cos(phi)
+    _z *= rho
 
-    # reinitialize the coordinates
-    rho, theta, phi = cs_.flatten()
+    _cos_theta, _sin_theta = np.cos(theta), np.sin(theta)
 
     # calculate the Cartesian coordinates
-    x = rho * np.sin(phi) * np.cos(theta)
-    y = rho * np.sin(phi) * np.sin(theta)
-    z = rho * np.cos(phi)
+    np.multiply(_cos_theta, _r_xy, out=x)
+    np.multiply(_sin_theta, _r_xy, out=y)
+    z[...] = _z
 
-    return x, y, z
+    return out